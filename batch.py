@@ -0,0 +1,95 @@
+"""
+
+Solve many nonograms without any input, using all the cores of the machine.
+
+The puzzles are read from a JSON list (like game_history.txt) or from a JSONL stream with one
+{"row": [...], "column": [...]} puzzle per line. One JSON result is written per line, in the same order as the puzzles:
+    {"index": 0, "solved": true, "time": 0.004, "iterations": 5, "board": [[1, -1, ...], ...]}
+
+Usage:
+    python batch.py game_history.txt --workers 8 --output results.jsonl
+
+"""
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from nonogram.game import Game
+from nonogram.store import PuzzleStore, ResultWriter
+
+
+def load_puzzles(path):
+    """ Yield the puzzles of a JSON list or a JSONL file ("-" reads from stdin) """
+    return iter(PuzzleStore(path))
+
+
+def solve_puzzle(puzzle, engine="overlap", search=False):
+    """ Solve a puzzle ({"row": [...], "column": [...]}) and return its result record """
+    start_time = time.perf_counter()
+    game = Game(puzzle["row"], puzzle["column"], engine=engine)
+    record = {}
+    if search:
+        solutions = game.search(max_solutions=1)
+        solved = len(solutions) == 1
+    elif game.solve():
+        solved = all(cell != 0 for row in game.board for cell in row) and game.lines_match_clues()
+    else:
+        solved = False
+        record["error"] = game.get_conflict_message()
+    record["solved"] = solved
+    record["time"] = time.perf_counter() - start_time
+    record["iterations"] = game.iterations
+    record["board"] = [[int(cell) for cell in row] for row in game.board]
+    return record
+
+
+def solve_puzzle_args(args):
+    index, puzzle, engine, search = args
+    record = solve_puzzle(puzzle, engine, search)
+    return {"index": index, **record}
+
+
+def solve_puzzle_chunk(chunk):
+    return [solve_puzzle_args(args) for args in chunk]
+
+
+def solve_batch(puzzles, workers=None, engine="overlap", search=False, chunksize=16, chunks_per_worker=4):
+    """ Solve the puzzles in a pool of processes (one per core by default) and yield their records in order
+
+    The puzzles are sent to the pool in chunks of chunksize, and only chunks_per_worker chunks per worker are
+    pending at any time: the next chunk is read from puzzles when the oldest one is done, so a long stream is never
+    held in memory. With workers=1 the puzzles are solved in this process
+    """
+    tasks = ((index, puzzle, engine, search) for index, puzzle in enumerate(puzzles))
+    if workers == 1:
+        yield from map(solve_puzzle_args, tasks)
+        return
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in iter(lambda: list(islice(tasks, chunksize)), []):
+            pending.append(executor.submit(solve_puzzle_chunk, chunk))
+            if len(pending) >= workers * chunks_per_worker:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve a batch of nonograms")
+    parser.add_argument("puzzles", help="JSON list or JSONL file with the puzzles (- for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="JSONL file for the results (stdout by default)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="number of processes (one per core)")
+    parser.add_argument("-e", "--engine", default="overlap", help="line engine (overlap or explain)")
+    parser.add_argument("-s", "--search", action="store_true", help="guess cells when the line logic gets stuck")
+    args = parser.parse_args()
+
+    with ResultWriter(args.output) as writer:
+        for record in solve_batch(load_puzzles(args.puzzles), args.workers, args.engine, args.search):
+            writer.write(record)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+
+Measure the speed of the solver on fixed puzzles, to catch performance regressions.
+
+The corpora are random nonograms generated from fixed seeds for every size and fill density, plus the puzzles in
+game_history.txt. For every corpus, Game.solve is timed on every puzzle, and Line.solve is timed separately on every
+row and column of the puzzles starting from an empty line. The report is written as JSON, and it can be compared
+with a saved baseline:
+
+    python benchmark.py --output baseline.json
+    (change the strategies)
+    python benchmark.py --baseline baseline.json
+
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+from nonogram.game import Game
+from nonogram.generator import generate_random_clues
+from nonogram.line import Line
+from nonogram.store import PuzzleStore
+
+SIZES = [10, 25, 50, 100]
+DENSITIES = [0.5, 0.6, 0.7]
+# Only the timings are compared with the baseline, the rest of the numbers must match exactly
+TIME_KEYS = ["game_time", "line_time"]
+
+
+def build_corpus(size, p, count, seed=0):
+    """ Generate count puzzles of size x size with fill density p, always the same ones for the same arguments """
+    rng = random.Random("{}x{}-{}-{}".format(size, size, p, seed))
+    corpus = []
+    for _ in range(count):
+        row_clues, column_clues, _ = generate_random_clues(size, size, p, rng=rng)
+        corpus.append({"row": row_clues, "column": column_clues})
+    return corpus
+
+
+def run_corpus(puzzles, engine="overlap", repeat=1, schedule="sweep"):
+    """ Time Game.solve and Line.solve on the puzzles (the best of repeat runs) """
+    game_times = []
+    line_times = []
+    for _ in range(repeat):
+        Line.cache.clear()
+        solved = 0
+        iterations = 0
+        game_line_solves = 0
+        line_solves = 0
+        start_time = time.perf_counter()
+        for puzzle in puzzles:
+            game = Game(puzzle["row"], puzzle["column"], engine=engine, schedule=schedule)
+            if game.solve():
+                solved += all(cell != 0 for row in game.board for cell in row) and game.lines_match_clues()
+            iterations += game.iterations
+            game_line_solves += game.line_solves
+            game.close()
+        game_times.append(time.perf_counter() - start_time)
+        cache_stats = Line.cache.get_stats()
+
+        Line.cache.clear()
+        start_time = time.perf_counter()
+        for puzzle in puzzles:
+            width = len(puzzle["column"])
+            height = len(puzzle["row"])
+            lines = ([Line(width, clues, engine=engine) for clues in puzzle["row"]]
+                     + [Line(height, clues, engine=engine) for clues in puzzle["column"]])
+            for line in lines:
+                line.solve()
+                line_solves += 1
+        line_times.append(time.perf_counter() - start_time)
+
+    return {
+        "puzzles": len(puzzles),
+        "solve_rate": solved / len(puzzles) if puzzles else 0,
+        "iterations": iterations,
+        "game_line_solves": game_line_solves,
+        "game_time": min(game_times),
+        "line_solves": line_solves,
+        "line_time": min(line_times),
+        "cache_hits": cache_stats["hits"],
+        "cache_misses": cache_stats["misses"],
+    }
+
+
+def run_benchmark(sizes=SIZES, densities=DENSITIES, count=10, seed=0, engine="overlap", repeat=1,
+                  history_path="game_history.txt", schedule="sweep"):
+    corpora = {}
+    for size in sizes:
+        for p in densities:
+            corpora["{}x{}-p{}".format(size, size, p)] = build_corpus(size, p, count, seed)
+    if history_path is not None:
+        corpora["history"] = list(PuzzleStore(history_path))
+
+    report = {
+        "settings": {
+            "engine": engine, "schedule": schedule, "count": count, "seed": seed, "repeat": repeat,
+            "python": platform.python_version(), "machine": platform.machine(),
+        },
+        "corpora": {},
+    }
+    for name, puzzles in corpora.items():
+        report["corpora"][name] = run_corpus(puzzles, engine, repeat, schedule)
+        print(name, report["corpora"][name], file=sys.stderr)
+    return report
+
+
+def compare_reports(report, baseline, tolerance=0.1):
+    """ Get the differences between a report and a baseline as a list of messages
+
+    A timing is a regression when it is more than (1 + tolerance) times its baseline. Any other number that changes
+    (solve rate, iterations...) is also reported, since it means the solver doesn't behave the same
+    """
+    messages = []
+    for name, results in report["corpora"].items():
+        if name not in baseline["corpora"]:
+            continue
+        base_results = baseline["corpora"][name]
+        for key, value in results.items():
+            base_value = base_results.get(key)
+            if base_value is None:
+                continue
+            if key in TIME_KEYS:
+                if value > base_value * (1 + tolerance):
+                    messages.append("{} {}: {:.4f}s -> {:.4f}s ({:+.0%})".format(
+                        name, key, base_value, value, value / base_value - 1))
+            elif key.startswith("cache"):
+                continue
+            elif value != base_value:
+                messages.append("{} {}: {} -> {}".format(name, key, base_value, value))
+    return messages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the nonogram solver")
+    parser.add_argument("-o", "--output", help="JSON file for the report (stdout by default)")
+    parser.add_argument("-b", "--baseline", help="JSON report to compare with")
+    parser.add_argument("-t", "--tolerance", type=float, default=0.1, help="allowed slowdown over the baseline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--densities", type=float, nargs="+", default=DENSITIES)
+    parser.add_argument("--count", type=int, default=10, help="puzzles per corpus")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="keep the best time of this many runs")
+    parser.add_argument("-e", "--engine", default="overlap", help="line engine (overlap or explain)")
+    parser.add_argument("--schedule", default="sweep", help="line schedule of Game (sweep, priority, batch or parallel)")
+    parser.add_argument("--history", default="game_history.txt", help="history file to include (none to skip)")
+    args = parser.parse_args()
+
+    history_path = None if args.history == "none" else args.history
+    report = run_benchmark(args.sizes, args.densities, args.count, args.seed, args.engine, args.repeat,
+                           history_path, args.schedule)
+    if args.output:
+        with open(args.output, 'w') as json_file:
+            json.dump(report, json_file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, 'r') as json_file:
+            baseline = json.load(json_file)
+        messages = compare_reports(report, baseline, args.tolerance)
+        for message in messages:
+            print(message)
+        if messages:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
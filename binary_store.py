@@ -0,0 +1,229 @@
+"""
+
+Compact binary container for puzzles and their solved boards, with random access through mmap.
+
+Layout of a file (all integers little endian):
+    header:  b"NONO", version (1 byte), 3 padding bytes, number of puzzles (uint32), offset of the index (uint64)
+    records: one after the other, see below
+    index:   the offset of every record (uint64 each)
+
+Every record is a sequence of varints (7 bits per byte, the high bit set while more bytes follow):
+    width, height, then for every row and then every column the number of clues followed by the clues, then the
+    board format (0: no board, 1: solved board, 1 bit per cell, 2: partial board, 2 bits per cell) followed by the
+    bit-packed cells, row by row.
+
+Reading puzzle number n only decodes that record, the rest of the file is never parsed.
+
+Usage:
+    python binary_store.py to-binary game_history.txt history.bin [--results results.jsonl]
+    python binary_store.py to-json history.bin history.jsonl
+
+"""
+import argparse
+import mmap
+import struct
+
+from nonogram.store import PuzzleStore, ResultWriter
+
+MAGIC = b"NONO"
+VERSION = 1
+HEADER = struct.Struct("<4sB3xIQ")
+
+NO_BOARD = 0
+SOLVED_BOARD = 1
+PARTIAL_BOARD = 2
+# Cell values of a partial board
+PARTIAL_CODES = {0: 0, 1: 1, -1: 2}
+PARTIAL_VALUES = (0, 1, -1)
+
+
+def write_varint(buffer, value):
+    while value >= 0x80:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data, offset):
+    """ Read a varint at offset and return it with the offset after it """
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def pack_board(buffer, board):
+    """ Add the board format and the bit-packed cells of the board to the buffer """
+    if board is None:
+        write_varint(buffer, NO_BOARD)
+        return
+    cells = [cell for row in board for cell in row]
+    if all(cell != 0 for cell in cells):
+        write_varint(buffer, SOLVED_BOARD)
+        bits = 1
+        codes = [cell == 1 for cell in cells]
+    else:
+        write_varint(buffer, PARTIAL_BOARD)
+        bits = 2
+        codes = [PARTIAL_CODES[cell] for cell in cells]
+    packed = 0
+    for i, code in enumerate(codes):
+        packed |= code << (i * bits)
+    buffer += packed.to_bytes((len(codes) * bits + 7) // 8, "little")
+
+
+def unpack_board(data, offset, width, height):
+    board_format, offset = read_varint(data, offset)
+    if board_format == NO_BOARD:
+        return None
+    bits = 1 if board_format == SOLVED_BOARD else 2
+    n_bytes = (width * height * bits + 7) // 8
+    packed = int.from_bytes(data[offset:offset + n_bytes], "little")
+    mask = (1 << bits) - 1
+    board = []
+    for i in range(height):
+        row = []
+        for j in range(width):
+            code = packed >> ((i * width + j) * bits) & mask
+            row.append((1 if code else -1) if board_format == SOLVED_BOARD else PARTIAL_VALUES[code])
+        board.append(row)
+    return board
+
+
+def encode_puzzle(row_clues, column_clues, board=None):
+    buffer = bytearray()
+    write_varint(buffer, len(column_clues))
+    write_varint(buffer, len(row_clues))
+    for clues in row_clues + column_clues:
+        write_varint(buffer, len(clues))
+        for clue in clues:
+            write_varint(buffer, clue)
+    pack_board(buffer, board)
+    return buffer
+
+
+def decode_puzzle(data, offset):
+    width, offset = read_varint(data, offset)
+    height, offset = read_varint(data, offset)
+    all_clues = []
+    for _ in range(height + width):
+        n_clues, offset = read_varint(data, offset)
+        clues = []
+        for _ in range(n_clues):
+            clue, offset = read_varint(data, offset)
+            clues.append(clue)
+        all_clues.append(clues)
+    puzzle = {"row": all_clues[:height], "column": all_clues[height:]}
+    board = unpack_board(data, offset, width, height)
+    if board is not None:
+        puzzle["board"] = board
+    return puzzle
+
+
+def write_binary(path, puzzles):
+    """ Write the puzzles ({"row": ..., "column": ..., "board": ... (optional)}) to a binary file
+
+    The puzzles are written as they come, only the index is kept in memory
+    """
+    offsets = []
+    with open(path, 'wb') as binary_file:
+        binary_file.write(HEADER.pack(MAGIC, VERSION, 0, 0))
+        offset = HEADER.size
+        for puzzle in puzzles:
+            offsets.append(offset)
+            record = encode_puzzle(puzzle["row"], puzzle["column"], puzzle.get("board"))
+            binary_file.write(record)
+            offset += len(record)
+        binary_file.write(struct.pack("<{}Q".format(len(offsets)), *offsets))
+        binary_file.seek(0)
+        binary_file.write(HEADER.pack(MAGIC, VERSION, len(offsets), offset))
+
+
+class BinaryPuzzleFile:
+    """ Read-only access to a binary puzzle file through mmap
+
+    Example:
+        with BinaryPuzzleFile("history.bin") as puzzles:
+            puzzle = puzzles[1000]
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as binary_file:
+            self.data = mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, self.index_offset = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            raise ValueError("{} is not a binary puzzle file".format(path))
+        if version != VERSION:
+            raise ValueError("Unsupported binary puzzle file version {}".format(version))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.data.close()
+
+    def __len__(self):
+        return self.count
+
+    def get_offset(self, n):
+        return struct.unpack_from("<Q", self.data, self.index_offset + 8 * n)[0]
+
+    def __getitem__(self, n):
+        if n < 0:
+            n += self.count
+        if not 0 <= n < self.count:
+            raise IndexError("There is no puzzle number {} in {}".format(n, self.path))
+        return decode_puzzle(self.data, self.get_offset(n))
+
+    def get(self, n):
+        return self[n]
+
+    def __iter__(self):
+        for n in range(self.count):
+            yield self[n]
+
+
+def json_to_binary(json_path, binary_path, results_path=None):
+    """ Convert a JSON or JSONL history to a binary file, adding the boards of a batch results file if given """
+    puzzles = iter(PuzzleStore(json_path))
+    if results_path is not None:
+        results = iter(PuzzleStore(results_path))
+        puzzles = ({**puzzle, "board": result.get("board")} for puzzle, result in zip(puzzles, results))
+    write_binary(binary_path, puzzles)
+
+
+def binary_to_json(binary_path, json_path):
+    """ Convert a binary file to JSONL (the boards are kept in the "board" key of each puzzle) """
+    with BinaryPuzzleFile(binary_path) as puzzles, ResultWriter(json_path) as writer:
+        for puzzle in puzzles:
+            writer.write(puzzle)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert puzzles between JSON and the binary format")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    to_binary = subparsers.add_parser("to-binary", help="JSON or JSONL history to binary")
+    to_binary.add_argument("source")
+    to_binary.add_argument("target")
+    to_binary.add_argument("--results", help="JSONL results of batch.py with the boards of the puzzles")
+    to_json = subparsers.add_parser("to-json", help="binary to JSONL")
+    to_json.add_argument("source")
+    to_json.add_argument("target")
+    args = parser.parse_args()
+
+    if args.command == "to-binary":
+        json_to_binary(args.source, args.target, args.results)
+    else:
+        binary_to_json(args.source, args.target)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+
+Load generator for service.py: sends bursts of puzzles and measures the throughput and the latency of the responses.
+
+Every burst sends --burst requests at once, spread over --connections connections, and waits for all the responses
+before the next one. A fraction --daily of the requests are the same puzzle (the puzzle of the day that everybody
+opens at once), the rest are random puzzles of the given size.
+
+Usage:
+    python service.py --port 8765
+    python loadgen.py --port 8765 --requests 2000 --burst 200
+
+    python loadgen.py --local --workers 4    (starts the service in this process)
+
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+
+from benchmark import build_corpus
+from service import SolveService
+
+
+def get_percentile(values, percentile):
+    """ Nearest-rank percentile of a list of values """
+    values = sorted(values)
+    index = max(int(len(values) * percentile / 100 + 0.5) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+def build_requests(count, size=25, p=0.6, daily=0.5, distinct=100, seed=0):
+    """ Build count puzzles, a fraction daily of them being the same puzzle and the rest drawn from distinct ones """
+    rng = random.Random(seed)
+    corpus = build_corpus(size, p, distinct + 1, seed)
+    daily_puzzle = corpus[0]
+    return [daily_puzzle if rng.random() < daily else rng.choice(corpus[1:]) for _ in range(count)]
+
+
+class Connection:
+    """ Connection to the service that matches the responses with the requests by id """
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.pending = {}
+        self.receiver = asyncio.create_task(self.receive())
+
+    @classmethod
+    async def open(cls, host, port):
+        reader, writer = await asyncio.open_connection(host, port, limit=2 ** 24)
+        return cls(reader, writer)
+
+    async def receive(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            response = json.loads(line)
+            self.pending.pop(response["id"]).set_result(response)
+
+    async def request(self, request_id, puzzle):
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        self.writer.write((json.dumps({"id": request_id, **puzzle}) + "\n").encode())
+        await self.writer.drain()
+        return await future
+
+    async def close(self):
+        """ Tell the service that there are no more requests and wait until it closes the connection """
+        self.writer.write_eof()
+        await self.receiver
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def run_load(host, port, puzzles, burst=100, connections=8):
+    """ Send the puzzles in bursts and return the latency of every request and the total time """
+    pool = [await Connection.open(host, port) for _ in range(connections)]
+    ids = itertools.count()
+    latencies = []
+    sources = {}
+
+    async def timed_request(connection, puzzle):
+        start_time = time.perf_counter()
+        response = await connection.request(next(ids), puzzle)
+        latencies.append(time.perf_counter() - start_time)
+        source = response.get("source", "error")
+        sources[source] = sources.get(source, 0) + 1
+
+    start_time = time.perf_counter()
+    for start in range(0, len(puzzles), burst):
+        await asyncio.gather(*(timed_request(pool[i % connections], puzzle)
+                               for i, puzzle in enumerate(puzzles[start:start + burst])))
+    total_time = time.perf_counter() - start_time
+    for connection in pool:
+        await connection.close()
+    return latencies, total_time, sources
+
+
+async def run_local(puzzles, burst, connections, workers, engine):
+    """ Start a service in this process on a free port and run the load against it """
+    async with SolveService(workers, engine) as service:
+        server = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0, limit=2 ** 24)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            result = await run_load("127.0.0.1", port, puzzles, burst, connections)
+        return (*result, service.stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the throughput and the latency of service.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--local", action="store_true", help="start the service in this process")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="processes of the local service")
+    parser.add_argument("-e", "--engine", default="overlap", help="line engine of the local service")
+    parser.add_argument("-n", "--requests", type=int, default=1000, help="total number of requests")
+    parser.add_argument("--burst", type=int, default=100, help="requests sent at once")
+    parser.add_argument("--connections", type=int, default=8, help="number of connections")
+    parser.add_argument("--daily", type=float, default=0.5, help="fraction of requests for the same puzzle")
+    parser.add_argument("--distinct", type=int, default=100, help="number of other puzzles")
+    parser.add_argument("--size", type=int, default=25, help="width and height of the puzzles")
+    parser.add_argument("--density", type=float, default=0.6, help="fill density of the puzzles")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    puzzles = build_requests(args.requests, args.size, args.density, args.daily, args.distinct, args.seed)
+    service_stats = None
+    if args.local:
+        latencies, total_time, sources, service_stats = asyncio.run(
+            run_local(puzzles, args.burst, args.connections, args.workers, args.engine))
+    else:
+        latencies, total_time, sources = asyncio.run(
+            run_load(args.host, args.port, puzzles, args.burst, args.connections))
+
+    report = {
+        "requests": len(latencies),
+        "throughput": len(latencies) / total_time,
+        "latency_p50": get_percentile(latencies, 50),
+        "latency_p99": get_percentile(latencies, 99),
+        "latency_max": max(latencies),
+        "sources": sources,
+    }
+    if service_stats is not None:
+        report["service"] = service_stats
+    print(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()
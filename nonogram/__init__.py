@@ -0,0 +1,45 @@
+"""
+
+This program aims to solve a nonogram in the same way a human would.
+I am trying to implement the logical steps I make when solving one myself.
+
+The solver core is in nonogram.line and nonogram.game, the rest of the modules (printers, generator, interactive
+programs) are only imported when they are used. The names below can be imported from the package directly, and
+importing the package alone loads none of them:
+
+    from nonogram import Game
+
+"""
+import importlib
+
+# Name -> module of the package where it is defined
+EXPORTS = {
+    "LineCache": "cache",
+    "ClueTable": "clues",
+    "get_clue_table": "clues",
+    "StrategyStats": "stats",
+    "LineMask": "linemask",
+    "DeductionLog": "deductions",
+    "PuzzleStore": "store",
+    "ResultWriter": "store",
+    "Line": "line",
+    "Game": "game",
+    "generate_random_clues": "generator",
+    "count_solutions": "generator",
+    "generate_unique_clues": "generator",
+    "run_game_history": "cli",
+}
+
+__all__ = list(EXPORTS)
+
+
+def __getattr__(name):
+    if name not in EXPORTS:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    value = getattr(importlib.import_module("." + EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,51 @@
+"""
+
+Cache of solved lines, shared by all the lines of all the games of a process.
+
+"""
+from collections import OrderedDict
+
+
+class LineCache:
+    """ Size-bounded LRU cache that maps (engine, clues, cells) to the changes made by solving the line, a tuple of
+    (index, value) of the cells that changed
+
+    The same short lines (and sublines) are solved many times, across the steps of a game and across games, so
+    the result of Line.solve is stored once and reused.
+
+    Attributes:
+        maxsize (int): the maximum number of lines stored, the least recently used ones are evicted
+        hits (int): number of lookups that found the line
+        misses (int): number of lookups that didn't find the line
+    """
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        changes = self.entries.get(key)
+        if changes is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return changes
+
+    def put(self, key, changes):
+        self.entries[key] = changes
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries), "maxsize": self.maxsize}
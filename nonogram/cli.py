@@ -0,0 +1,186 @@
+"""
+
+Interactive programs: solve a random nonogram, or type the clues of a puzzle (or load them from the history) and
+edit them until the puzzle is right.
+
+Usage:
+    python -m nonogram
+    python main.py
+
+"""
+from .game import Game
+from .generator import generate_random_clues
+
+
+def run_game_history(game_history_path, width=15, height=15):
+    """ Solve a puzzle typed in or loaded from the history, and let the user edit its clues """
+    # game_history_path = "game_history.json"
+
+    def read_clue(clue_str):
+        clues = []
+        curr_num = ""
+        for char in clue_str:
+            if char.isdigit():
+                curr_num += char
+            elif curr_num != "":
+                clues.append(int(curr_num))
+                curr_num = ""
+        if curr_num != "":
+            clues.append(int(curr_num))
+        return clues
+
+    from .store import PuzzleStore
+    game_history = PuzzleStore(game_history_path)
+    game_history.convert_json_list()
+    history_length = len(game_history)
+
+    game_loaded = False
+    if history_length > 0:
+        history_input = input("Load game from history? (Y/N/P): ")
+        if history_input == "P":
+            game_loaded = True
+            puzzle = game_history.get(-1)
+            row_clues = puzzle["row"]
+            column_clues = puzzle["column"]
+        elif history_input == "Y":
+            game_loaded = True
+            print(str(history_length) + " games in history")
+            game_to_load = input("Load game number ")
+            game_to_load = int(game_to_load)
+            puzzle = game_history.get(game_to_load)
+            row_clues = puzzle["row"]
+            column_clues = puzzle["column"]
+
+    if not game_loaded:
+        row_clues = []
+        row = 0
+        while row < height:
+            clue_str = input("Row " + str(row) + ": ")
+            if clue_str == "-":
+                row = max(row - 1, 0)
+            clue = read_clue(clue_str)
+            row_clues.append(clue)
+            row += 1
+
+        column_clues = []
+        column = 0
+        while column < width:
+            clue_str = input("Column " + str(column) + ": ")
+            if clue_str == "-":
+                column = max(column - 1, 0)
+                continue
+            clue = read_clue(clue_str)
+            column_clues.append(clue)
+            column += 1
+
+    game = Game(row_clues, column_clues)
+
+    def solve_game():
+        if not game.solve():
+            print(game.get_conflict_message())
+        game.print_game()
+
+    solve_game()
+
+    edit = True
+    while edit:
+        try:
+            edit_str = input("Edit: ")
+            index = int(edit_str[1:]) - 1
+            if index < 0:
+                print("The index must be >= 1")
+                continue
+            if edit_str[0] in "Cc":
+                orientation = "column"
+                current_clue = column_clues[index]
+            elif edit_str[0] in "Rr":
+                orientation = "row"
+                current_clue = row_clues[index]
+            else:
+                break
+            print("Current clue in " + orientation + " " + str(index + 1) + ": " + str(current_clue))
+            new_clue = input("New clue: ")
+            new_clue = read_clue(new_clue)
+            current_clue[:] = new_clue
+            if orientation == "row":
+                game.set_row_clue(index, current_clue)
+            else:
+                game.set_column_clue(index, current_clue)
+            solve_game()
+            print("New clue in " + orientation + " " + str(index + 1) + ": " + str(new_clue))
+
+        except ValueError:
+            break
+
+    game_history.append(row_clues, column_clues)
+
+    return row_clues, column_clues
+
+
+def main(width=15, height=15):
+    """ Solve a random nonogram and check the result """
+
+    row_clues, column_clues, solution = generate_random_clues(width, height, 0.6)
+
+    # row_clues = [
+    #     [7],
+    #     [7],
+    #     [1, 1, 1, 1],
+    #     [3, 3],
+    #     [3, 3],
+    #     [2, 1, 1, 2],
+    #     [3, 3],
+    #     [9],
+    #     [7],
+    #     [2, 2],
+    #     [2, 3],
+    #     [6, 1],
+    #     [2, 2, 3],
+    #     [4, 3, 1],
+    #     [2, 3, 1, 3],
+    #     [3, 1, 5],
+    #     [4, 5],
+    #     [4, 5],
+    #     [1, 1, 1, 1],
+    #     [1, 1, 1, 1]
+    # ]
+    # print(sum([sum(clue) for clue in row_clues])/(width*height))
+    #
+    # column_clues = [
+    #     [4],
+    #     [7],
+    #     [3, 2, 3],
+    #     [4, 1, 4, 4],
+    #     [2, 2, 3, 2, 3],
+    #     [3, 8, 1],
+    #     [2, 4, 2],
+    #     [2, 2, 2],
+    #     [2, 6, 1],
+    #     [3, 6, 3],
+    #     [2, 2, 3, 3, 3],
+    #     [4, 1, 1, 6],
+    #     [3, 5],
+    #     [6],
+    #     [3]
+    # ]
+
+    # game = Game(row_clues, column_clues)
+    # game.board = solution
+    # game.update_lines()
+    # if game.is_solved():
+    #     print("THE PUZZLE HAS A SOLUTION")
+    # else:
+    #     print("INCORRECT PUZZLE")
+    #     game.print_game()
+    #     sys.exit()
+    game = Game(row_clues, column_clues)
+    game.solve()
+    game.print_game()
+    if game.is_solved():
+        print("CORRECT")
+    else:
+        print("INCORRECT")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+
+Placement tables of the clues of a line, built once per (length, clues) and cached.
+
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+ClueTable = namedtuple("ClueTable", [
+    "length", "clues", "min_length", "wiggle_room", "prefix_lengths", "suffix_lengths", "earliest_starts",
+    "latest_starts",
+])
+ClueTable.__doc__ = """ Placement data of the clues of a line, which never changes while the line is solved
+
+    Attributes:
+        length (int): the length of the line
+        clues (tuple[int]): the clues of the line
+        min_length (int): the length of the clues placed one after the other
+        wiggle_room (int): the free cells left when the clues are placed one after the other
+        prefix_lengths (tuple[int]): prefix_lengths[j] is the min length of the first j clues
+        suffix_lengths (tuple[int]): suffix_lengths[j] is the min length of the clues from j onwards
+        earliest_starts (tuple[int]): the first cell where each clue can start
+        latest_starts (tuple[int]): the last cell where each clue can start
+
+    Example:
+        A line of length 15 with the clues [4, 3, 4] has min_length = 13, wiggle_room = 2,
+        earliest_starts = (0, 5, 9) and latest_starts = (2, 7, 11)
+"""
+
+
+@lru_cache(maxsize=100000)
+def get_clue_table(length, clues):
+    """ Build the ClueTable of a line (clues must be a tuple). Tables are cached, so each one is built only once """
+    prefix_lengths = [0]
+    for clue in clues:
+        prefix_lengths.append(prefix_lengths[-1] + clue + (len(prefix_lengths) > 1))
+    suffix_lengths = [0]
+    for clue in reversed(clues):
+        suffix_lengths.append(suffix_lengths[-1] + clue + (len(suffix_lengths) > 1))
+    suffix_lengths.reverse()
+    min_length = prefix_lengths[-1]
+    earliest_starts = tuple(prefix_lengths[j] + (j > 0) for j in range(len(clues)))
+    latest_starts = tuple(length - suffix_lengths[j] for j in range(len(clues)))
+    return ClueTable(length, clues, min_length, length - min_length, tuple(prefix_lengths), tuple(suffix_lengths),
+                     earliest_starts, latest_starts)
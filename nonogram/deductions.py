@@ -0,0 +1,77 @@
+"""
+
+Replayable log of every cell decided while a game is solved (see Game(log=True)).
+
+"""
+from array import array
+
+
+class DeductionLog:
+    """ Append-only log of the cells decided while a game is solved
+
+    Every event is a cell (its index in the board, row by row), the value written, the line that wrote it (its
+    index in Game.lines, -1 for search guesses), the strategy and the iteration of Game.solve. The events are
+    stored in compact arrays of integers, and the strategy names are stored once and referenced by id.
+
+    The log has every deduction of the lines, including the ones that conflicted with the board, so the board can
+    be rebuilt at any point with replay and the first contradiction can be found with find_conflict.
+    With Game.search, the events of all the branches are in the log, one after the other.
+    """
+    def __init__(self):
+        self.cells = array("i")
+        self.values = array("b")
+        self.lines = array("i")
+        self.strategy_ids = array("B")
+        self.iterations = array("i")
+        self.strategies = []
+        self.strategy_index = {}
+        # Iteration of the events that are appended (updated by Game.solve_step)
+        self.iteration = 0
+
+    def __len__(self):
+        return len(self.cells)
+
+    def append(self, cell, value, line, strategy):
+        strategy_id = self.strategy_index.get(strategy)
+        if strategy_id is None:
+            strategy_id = self.strategy_index[strategy] = len(self.strategies)
+            self.strategies.append(strategy)
+        self.cells.append(cell)
+        self.values.append(value)
+        self.lines.append(line)
+        self.strategy_ids.append(strategy_id)
+        self.iterations.append(self.iteration)
+
+    def get_event(self, n):
+        """ The event number n as (cell, value, line, strategy, iteration) """
+        return (self.cells[n], self.values[n], self.lines[n], self.strategies[self.strategy_ids[n]],
+                self.iterations[n])
+
+    def __iter__(self):
+        for n in range(len(self)):
+            yield self.get_event(n)
+
+    def replay(self, width, height, step=None, iteration=None):
+        """ Rebuild the board after the first step events, or after all the events up to the given iteration """
+        board = [[0] * width for _ in range(height)]
+        for n in range(len(self) if step is None else step):
+            if iteration is not None and self.iterations[n] > iteration:
+                break
+            cell = self.cells[n]
+            board[cell // width][cell % width] = self.values[n]
+        return board
+
+    def find_conflict(self):
+        """ Get the number of the first event that contradicts an earlier one, or None if there are none """
+        values = {}
+        for n in range(len(self)):
+            value = values.setdefault(self.cells[n], self.values[n])
+            if value != self.values[n]:
+                return n
+        return None
+
+    def to_dict(self):
+        return {
+            "strategies": self.strategies,
+            "events": [list(event) for event in self],
+        }
@@ -0,0 +1,778 @@
+"""
+
+The board of a nonogram, and how the solutions of its rows and columns are combined.
+
+"""
+import heapq
+import time
+from collections import deque
+
+from .clues import get_clue_table
+from .deductions import DeductionLog
+from .line import Line
+from .linemask import LineMask
+from .stats import StrategyStats
+
+# NumPy is optional and slow to import, so it is only imported by the first game with a NumPy board
+numpy = None
+
+
+def import_numpy():
+    global numpy
+    if numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("NumPy is needed to use a NumPy board") from None
+    return numpy
+
+
+class Game:
+
+    SCHEDULES = ("sweep", "priority", "batch", "parallel")
+
+    def __init__(self, row_clues: list[list[int]], column_clues: list[list[int]], width: int=None, height: int=None,
+                 engine: str="overlap", use_numpy: bool=False, profile: bool=False, log: bool=False,
+                 schedule: str="sweep", workers: int=None):
+        if width != len(column_clues) and width is not None:
+            raise ValueError("The number of column clues must be equal to the width")
+        if height != len(row_clues) and height is not None:
+            raise ValueError("The number of row clues must be equal to the height")
+        if width is None:
+            width = len(column_clues)
+        if height is None:
+            height = len(row_clues)
+        if schedule not in self.SCHEDULES:
+            raise ValueError("The schedule must be one of {}".format(", ".join(self.SCHEDULES)))
+        if schedule == "batch":
+            # The batched kernel works on the NumPy board directly, without going through Line.solve
+            if engine != "overlap":
+                raise ValueError("The batch schedule solves the lines with the overlap engine")
+            if profile or log:
+                raise ValueError("The batch schedule can't profile or log the strategies of the lines")
+            use_numpy = True
+        if schedule == "parallel":
+            # The lines are solved in other processes on a shared board, see solve_step_parallel
+            if use_numpy:
+                raise ValueError("The parallel schedule keeps its own shared board, it can't use a NumPy board")
+            if profile or log:
+                raise ValueError("The parallel schedule can't profile or log the strategies of the lines")
+        self.schedule = schedule
+        self.workers = workers
+        self.width = width
+        self.height = height
+        self.row_clues = row_clues
+        self.column_clues = column_clues
+        self.engine = engine
+        self.rows = [Line(width, row_clue, engine=engine) for row_clue in row_clues]
+        self.columns = [Line(height, column_clue, engine=engine) for column_clue in column_clues]
+        self.use_numpy = use_numpy
+        if use_numpy:
+            import_numpy()
+            # The cells of every row and column are views of the board, so a line writes its new cells straight into
+            # the board and the crossing lines see them without any merge. A line can't disagree with the board, a
+            # contradiction is found by the next solve of a crossing line (see update_board_numpy)
+            self.board = numpy.zeros((height, width), dtype=numpy.int8)
+            for i, row in enumerate(self.rows):
+                row.cells = self.board[i]
+            for j, column in enumerate(self.columns):
+                column.cells = self.board[:, j]
+        else:
+            self.board = [[0] * width for _ in range(height)]
+        self.lines = self.rows + self.columns
+        self.stats = StrategyStats() if profile else None
+        self.log = DeductionLog() if log else None
+        for line in self.lines:
+            line.stats = self.stats
+        if self.log is not None:
+            for n, line in enumerate(self.lines):
+                line.log = self.log
+                line.index = n
+                if n < height:
+                    line.cell_indices = range(n * width, (n + 1) * width)
+                else:
+                    line.cell_indices = range(n - height, width * height, width)
+        # Clues of the rows and the columns packed in arrays for the batch schedule, see get_clue_arrays
+        self.clue_arrays = None
+        # Worker processes and shared board of the parallel schedule, started by the first solve_step_parallel
+        self.parallel = None
+        # Number of cells each queued line got since it was last solved (used by the priority schedule)
+        self.new_cells = [0] * len(self.lines)
+        # Lines (indices in self.lines) with new information that have to be solved again. self.queue has them in
+        # the order they were queued, except with the priority schedule, which keeps them in the heap
+        # self.priority_queue instead (see queue_line)
+        self.queue = deque()
+        self.queued = set()
+        self.priority_queue = []
+        # Number of lines queued so far, and the number each queued line got when it was queued (the position of
+        # the line in the queue, the priority schedule breaks ties with it)
+        self.queue_count = 0
+        self.queue_positions = [0] * len(self.lines)
+        for n in range(len(self.lines)):
+            self.queue_line(n, 0)
+        self.iterations = 0
+        self.line_solves = 0
+        # (line index, i, j) of the first contradiction found by solve, the line index is -1 if a row and a column
+        # disagree on the cell [i][j] (see get_conflict_message)
+        self.conflict = None
+        # (line index, time) that decided every cell of the board, -1 if it wasn't a line (see set_clue). The time of
+        # a line solve is the number of line solves whose cells it could see, so a line sees the cells with a smaller
+        # time. It isn't the iteration: on a NumPy board and with the batch and parallel schedules, a line already
+        # sees the cells of the lines solved before it in the same iteration
+        self.origins = [[None] * width for _ in range(height)]
+        # Time of the last solve of every line (see solve_line)
+        self.line_times = [0] * len(self.lines)
+        # Limits of the current solve (see solve): time.perf_counter() value and total number of line solves after
+        # which no more lines are solved, None for no limit
+        self.deadline = None
+        self.line_solve_limit = None
+        # False if the last solve stopped because of its limits, with lines still in the queue
+        self.solve_finished = True
+
+    def get_row(self, n):
+        return self.rows[n]
+
+    def get_column(self, n):
+        return self.columns[n]
+
+    #### PRINTING (see nonogram.printing) ####
+    @staticmethod
+    def print_board(board):
+        from .printing import print_board
+        print_board(board)
+
+    def print_game(self, show_clues=True):
+        from .printing import print_game
+        print_game(self, show_clues)
+
+    def print_rows(self):
+        from .printing import print_rows
+        print_rows(self)
+
+    def print_columns(self):
+        from .printing import print_columns
+        print_columns(self)
+
+    def queue_line(self, n, new_cells=1):
+        """ Add the line self.lines[n] to the queue of lines that have to be solved again, with the number of new
+        cells it got
+
+        With the priority schedule the line is pushed into the heap self.priority_queue with its new priority (see
+        get_line_priority). The entries it had with an older priority are left in the heap, and skipped when they
+        come out (see pop_priority_line), so queueing a line is O(log(lines)) instead of a search of the queue
+        """
+        self.new_cells[n] += new_cells
+        if n not in self.queued:
+            self.queued.add(n)
+            self.queue_positions[n] = self.queue_count
+            self.queue_count += 1
+            if self.schedule != "priority":
+                self.queue.append(n)
+        if self.schedule == "priority":
+            heapq.heappush(self.priority_queue, (self.get_line_priority(n), self.queue_positions[n], n))
+
+    def pop_priority_line(self):
+        """ Take the queued line with the lowest priority (see get_line_priority) out of the queue, the first one
+        queued if there is a tie
+
+        Returns:
+            int: the index of the line in self.lines
+        """
+        while True:
+            priority, position, n = heapq.heappop(self.priority_queue)
+            if n in self.queued and position == self.queue_positions[n] and priority == self.get_line_priority(n):
+                break
+        self.queued.discard(n)
+        self.new_cells[n] = 0
+        if not self.queued:
+            # Only outdated entries are left
+            self.priority_queue.clear()
+        return n
+
+    def merge_cell(self, i, j):
+        """ Merge the row and column values of a cell into the board
+
+        Returns True if the row or the column don't have the merged value yet (they have new information). If they
+        have different values, the cell is left as it is and self.conflict is set
+        """
+        row_value = self.rows[i].get_cell(j)
+        column_value = self.columns[j].get_cell(i)
+        if row_value == 0:
+            value = column_value
+        elif column_value == 0 or row_value == column_value:
+            value = row_value
+        else:
+            self.conflict = (-1, i, j)
+            return False
+        if self.board[i][j] != value:
+            if self.board[i][j] == 0:
+                n = i if row_value == value else self.height + j
+                self.origins[i][j] = (n, self.line_times[n])
+            self.board[i][j] = value
+        if row_value != value:
+            self.queue_line(i)
+        if column_value != value:
+            self.queue_line(self.height + j)
+        return row_value != value or column_value != value
+
+    def update_board(self, rows=None, columns=None):
+        """ Merge the cells of the given rows and columns (all of them by default) into the board
+
+        Only the cells changed by the last solve of the given lines (Line.changed) are merged: the other cells of
+        the lines already have the values of the board. With no lines, all the cells of all the rows are merged. A
+        NumPy board has nothing to merge, see update_board_numpy.
+        The lines that get a new cell are added to the queue. The merge stops after the line with a conflict, if any
+        (see merge_cell).
+
+        Returns:
+            list[tuple[int, int]]: the positions of the cells where the row or the column has to be updated
+        """
+        if self.use_numpy:
+            return self.update_board_numpy(rows, columns)
+        changed = []
+        if rows is None and columns is None:
+            for i in range(self.height):
+                for j in range(self.width):
+                    if self.merge_cell(i, j):
+                        changed.append((i, j))
+                if self.conflict is not None:
+                    return changed
+            return changed
+        for i in rows or []:
+            for j in self.rows[i].changed:
+                if self.merge_cell(i, j):
+                    changed.append((i, j))
+            if self.conflict is not None:
+                return changed
+        for j in columns or []:
+            for i in self.columns[j].changed:
+                if self.merge_cell(i, j):
+                    changed.append((i, j))
+            if self.conflict is not None:
+                return changed
+        return changed
+
+    def update_board_numpy(self, rows=None, columns=None):
+        """ update_board for a NumPy board: the lines already wrote their cells into the board, so the cells changed
+        by the last solve of the given lines (all of them by default) only get their origin (they were all empty
+        before), and the crossing lines are queued
+
+        Returns:
+            list: always empty, no line has to be updated
+        """
+        if rows is None and columns is None:
+            rows = range(self.height)
+            columns = range(self.width)
+        for i in rows or []:
+            for j in self.rows[i].changed:
+                self.origins[i][j] = (i, self.line_times[i])
+                self.queue_line(self.height + j)
+        for j in columns or []:
+            for i in self.columns[j].changed:
+                self.origins[i][j] = (self.height + j, self.line_times[self.height + j])
+                self.queue_line(i)
+        return []
+
+    def update_lines(self, cells=None):
+        """ Copy the board into the lines (only the given cells, if any), and into the shared board of the parallel
+        schedule
+        """
+        if self.use_numpy:
+            # The lines are views of the board
+            return
+        if cells is None:
+            if self.parallel is not None:
+                self.parallel.write_board(self.board)
+            cells = ((i, j) for i in range(self.height) for j in range(self.width))
+        elif self.parallel is not None:
+            for i, j in cells:
+                self.parallel.board[i * self.width + j] = self.board[i][j]
+        for i, j in cells:
+            self.rows[i].set_cell(j, self.board[i][j])
+            self.columns[j].set_cell(i, self.board[i][j])
+
+    def update(self, rows=None, columns=None):
+        """ Merge the given rows and columns into the board and copy the merged cells back into the lines
+
+        Returns False if there is a conflict between a row and a column (see merge_cell)
+        """
+        changed = self.update_board(rows, columns)
+        if self.conflict is not None:
+            return False
+        self.update_lines(changed)
+        return True
+
+    def fill_start_clues(self):
+        for line in self.lines:
+            line.fill_start_clues()
+        self.update()
+
+    def fill_edge_clues(self):
+        for i, line in enumerate(self.lines):
+            line.fill_edge_clues()
+        self.update()
+
+    def add_crosses_at_edge_groups(self):
+        for line in self.lines:
+            line.add_crosses_at_edge_groups()
+        self.update()
+
+    def surround_single_clues_with_crosses(self):
+        for line in self.lines:
+            line.surround_single_clue_with_crosses()
+        self.update()
+
+    def surround_max_size_groups_with_crosses(self):
+        for line in self.lines:
+            line.surround_max_size_groups_with_crosses()
+        self.update()
+
+    def solve_step(self):
+        """ Solve the lines in the queue and merge their cells into the board
+
+        With the "sweep" schedule all the lines in the queue are solved, and then merged together. Only the lines
+        that got new cells in the previous step are in the queue, so the lines that are already stable are not
+        solved again.
+
+        With the "priority" schedule only the best queued line is solved (see get_line_priority), and it is merged
+        right away, so the next line already sees its new cells.
+
+        With the "batch" schedule all the queued rows are solved together and merged, and then all the queued
+        columns (see solve_step_batch). The "parallel" schedule does the same, splitting the lines between worker
+        processes (see solve_step_parallel)
+
+        Returns False as soon as a line has no valid arrangement or a row and a column disagree, without solving the
+        rest of the lines. self.conflict has the line and the position of the contradiction.
+
+        When the limits of the current solve run out (see get_line_budget) the step stops before the next line, the
+        lines solved so far are merged and the rest stay queued
+        """
+        self.iterations += 1
+        if self.log is not None:
+            self.log.iteration = self.iterations
+        if self.schedule == "batch":
+            return self.solve_step_batch()
+        if self.schedule == "parallel":
+            return self.solve_step_parallel()
+        if self.schedule == "priority":
+            n = self.pop_priority_line()
+            if not self.solve_line(n):
+                return False
+            if n < self.height:
+                return self.update([n], [])
+            return self.update([], [n - self.height])
+        rows = []
+        columns = []
+        # On a list board the lines of the step only see the cells merged before it
+        solve_time = None if self.use_numpy else self.line_solves
+        while self.queue and self.get_line_budget() != 0:
+            n = self.queue.popleft()
+            self.queued.discard(n)
+            self.new_cells[n] = 0
+            if not self.solve_line(n, solve_time):
+                if self.use_numpy:
+                    # The lines solved before already wrote their cells into the board
+                    self.update_board_numpy(rows, columns)
+                return False
+            if n < self.height:
+                rows.append(n)
+            else:
+                columns.append(n - self.height)
+        return self.update(rows, columns)
+
+    def solve_line(self, n, solve_time=None):
+        """ Solve the line self.lines[n], setting self.conflict if its clues don't fit anymore
+
+        The time of the solve (see self.origins) is the number of line solves so far, unless solve_time is given
+
+        The line stops at the deadline of the current solve too (see Line.solve). Then the cells it decided are
+        merged as usual, and it is queued again to finish later
+        """
+        line = self.lines[n]
+        line.deadline = self.deadline
+        self.line_times[n] = self.line_solves if solve_time is None else solve_time
+        self.line_solves += 1
+        if line.solve():
+            if not line.solve_finished:
+                self.queue_line(n, 0)
+            return True
+        # The line stays queued, so it is checked again if the board changes (see set_clue)
+        self.queue_line(n)
+        if n < self.height:
+            self.conflict = (n, n, line.conflict)
+        else:
+            self.conflict = (n, line.conflict, n - self.height)
+        return False
+
+    def pop_queued_lines(self, offset, count):
+        """ Take the lines offset to offset + count - 1 out of the queue, as many as the limits of the current solve
+        allow (see get_line_budget)
+
+        Returns:
+            list: the indices of the lines taken, minus offset
+        """
+        indices = [n - offset for n in self.queue if offset <= n < offset + count]
+        budget = self.get_line_budget()
+        if budget is not None:
+            indices = indices[:budget]
+        taken = set(offset + index for index in indices)
+        self.queue = deque(n for n in self.queue if n not in taken)
+        for n in taken:
+            self.queued.discard(n)
+            self.new_cells[n] = 0
+        return indices
+
+    def solve_step_batch(self):
+        """ Solve the queued rows with a single call of the batched kernel (nonogram.kernel) and write them into the
+        board, and then the same with the queued columns (the transposed board), which already see the new cells of
+        the rows
+        """
+        from .kernel import solve_lines
+        if self.clue_arrays is None:
+            self.clue_arrays = self.get_clue_arrays()
+        for offset, count, layer in ((0, self.height, self.board), (self.height, self.width, self.board.T)):
+            indices = self.pop_queued_lines(offset, count)
+            if not indices:
+                continue
+            clues, counts = self.clue_arrays[offset > 0]
+            solved, fit = solve_lines(layer[indices], clues[indices], counts[indices])
+            solve_time = self.line_solves
+            self.line_solves += len(indices)
+            if not fit.all():
+                # None of the lines is written, so they all stay queued
+                for index in indices:
+                    self.queue_line(offset + index, 0)
+                k = int(numpy.argmin(fit))
+                n = offset + indices[k]
+                self.queue_line(n)
+                position = LineMask.from_cells(layer[indices[k]].tolist()).find_conflict(self.lines[n].clues)
+                self.conflict = (n, n, position) if offset == 0 else (n, position, indices[k])
+                return False
+            # The kernel only fills empty cells, so the crossing lines of the new cells are the ones to queue
+            for k, p in numpy.argwhere(solved != layer[indices]).tolist():
+                if offset == 0:
+                    self.origins[indices[k]][p] = (indices[k], solve_time)
+                    self.queue_line(self.height + p)
+                else:
+                    self.origins[p][indices[k]] = (offset + indices[k], solve_time)
+                    self.queue_line(p)
+            layer[indices] = solved
+        return True
+
+    def solve_step_parallel(self):
+        """ Solve the queued rows in the worker processes of nonogram.parallel and merge the cells they changed, and
+        then the same with the queued columns
+
+        The workers read the lines from a shared board and write their new cells into it, and only the positions
+        and values of the changed cells come back. A row never disagrees with a column, since the rows are solved
+        from the merged board and the columns from the board with the new cells of the rows
+        """
+        if self.parallel is None:
+            from .parallel import ParallelSolver
+            self.parallel = ParallelSolver(self.width, self.height, self.row_clues, self.column_clues, self.engine,
+                                           self.workers)
+            self.parallel.write_board(self.board)
+        for offset, count in ((0, self.height), (self.height, self.width)):
+            indices = self.pop_queued_lines(offset, count)
+            if not indices:
+                continue
+            changed_cells, changed_values, conflict = self.parallel.solve_lines(offset > 0, indices)
+            solve_time = self.line_solves
+            self.line_solves += len(indices)
+            # The cells changed before a conflict are already in the shared board, so they are merged anyway
+            for cell, value in zip(changed_cells, changed_values):
+                i, j = divmod(cell, self.width)
+                self.board[i][j] = value
+                self.origins[i][j] = (i if offset == 0 else offset + j, solve_time)
+                self.rows[i].set_cell(j, value)
+                self.columns[j].set_cell(i, value)
+                self.queue_line(self.height + j if offset == 0 else i)
+            if conflict is not None:
+                # A worker stops at its first conflict, so some of the lines may not have been solved
+                for index in indices:
+                    self.queue_line(offset + index, 0)
+                index, position = conflict
+                n = offset + index
+                self.queue_line(n)
+                self.conflict = (n, index, position) if offset == 0 else (n, position, index)
+                return False
+        return True
+
+    def close(self):
+        """ Stop the worker processes of the parallel schedule and free the shared board (they are started again if
+        needed)
+        """
+        if self.parallel is not None:
+            self.parallel.close()
+            self.parallel = None
+
+    def get_clue_arrays(self):
+        """ The clues of the rows and of the columns packed for the batched kernel (see kernel.pack_clues) """
+        from .kernel import pack_clues
+        return pack_clues(self.row_clues), pack_clues(self.column_clues)
+
+    def get_line_priority(self, n):
+        """ Score of a queued line for the priority schedule, the lowest is solved first
+
+        Lines with little slack (free cells left when the clues are packed together) and many new cells are the
+        most likely to decide cells
+        """
+        line = self.lines[n]
+        return line.table.wiggle_room - self.new_cells[n]
+
+    def get_line_budget(self):
+        """ Number of lines the current solve can still solve, None if it has no limits
+
+        Returns 0 once the deadline has passed. The deadline is checked between line solves, and by the explain
+        engine inside a line solve (see solve_line). The batch and parallel schedules only check it between phases
+        """
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            return 0
+        if self.line_solve_limit is not None:
+            return max(self.line_solve_limit - self.line_solves, 0)
+        return None
+
+    def solve(self, deadline=None, max_line_solves=None):
+        """ Solve lines until the board doesn't change anymore, or until the deadline or the maximum number of line
+        solves is reached
+
+        The lines that are left are kept in the queue, so the next call continues where this one stopped and the
+        board always has the cells decided so far.
+
+        Args:
+            deadline (float): time.perf_counter() value after which no more lines are solved (None for no limit)
+            max_line_solves (int): maximum number of lines solved by this call (None for no limit)
+
+        Returns:
+            bool: False if a contradiction was found (see solve_step), True otherwise. self.solve_finished is False if
+            the limits stopped the solve before the board stopped changing (see get_decided_percentage)
+
+        Example:
+            game.solve(deadline=time.perf_counter() + 0.05)
+            while not game.solve_finished:
+                print(game.get_decided_percentage())
+                game.solve(max_line_solves=100)
+        """
+        self.solve_finished = True
+        if self.conflict is not None:
+            return False
+        self.deadline = deadline
+        self.line_solve_limit = None if max_line_solves is None else self.line_solves + max_line_solves
+        try:
+            while self.queued:
+                if self.get_line_budget() == 0:
+                    self.solve_finished = False
+                    break
+                if not self.solve_step():
+                    return False
+        finally:
+            self.deadline = None
+            self.line_solve_limit = None
+        return True
+
+    def get_decided_percentage(self):
+        """ Percentage of the cells of the board that are decided (boxes or crosses) """
+        if self.width * self.height == 0:
+            return 100.0
+        if self.use_numpy:
+            decided = int(numpy.count_nonzero(self.board))
+        else:
+            decided = sum(len(row) - row.count(0) for row in self.board)
+        return 100 * decided / (self.width * self.height)
+
+    def get_conflict_message(self):
+        """ Describe self.conflict, or None if there is no conflict """
+        if self.conflict is None:
+            return None
+        n, i, j = self.conflict
+        if n == -1:
+            return "There is a conflict between the row and column values at position [{}], [{}]".format(i, j)
+        if n < self.height:
+            line_name = "row {}".format(n)
+        else:
+            line_name = "column {}".format(n - self.height)
+        return "The clues {} don't fit in the {} (first conflict at position [{}], [{}])".format(
+            self.lines[n].clues, line_name, i, j)
+
+    def is_solved(self):
+        for i, row in enumerate(self.rows):
+            if not row.is_solved():
+                print("Error in row", i)
+                return False
+        for i, column in enumerate(self.columns):
+            if not column.is_solved():
+                print("Error in column", i)
+                return False
+        return True
+
+    #### CLUE EDITION ####
+    def set_row_clue(self, i, clues):
+        self.set_clue(i, clues)
+
+    def set_column_clue(self, j, clues):
+        self.set_clue(self.height + j, clues)
+
+    def set_clue(self, n, clues):
+        """ Change the clues of the line self.lines[n], keeping the deductions that don't depend on them
+
+        Every decided cell remembers the line and the time that decided it (self.origins). Going through the
+        cells in the order they were decided, a cell is invalid if the edited line decided it, or if the line that
+        decided it already had an invalid cell by then. The invalid cells are emptied and the lines that lose cells
+        are queued, so solve only has to repeat the work that depended on the old clues.
+        """
+        if n < self.height:
+            self.row_clues[n] = clues
+        else:
+            self.column_clues[n - self.height] = clues
+        line = self.lines[n]
+        line.clues = clues
+        line.table = get_clue_table(line.length, tuple(clues))
+        self.clue_arrays = None
+        # The workers of the parallel schedule have the old clues
+        self.close()
+
+        decided = []
+        for i in range(self.height):
+            for j in range(self.width):
+                if self.board[i][j] != 0:
+                    origin_line, iteration = self.origins[i][j]
+                    decided.append((iteration, i, j, origin_line))
+        decided.sort()
+        # Time (see self.origins) from which each line has seen invalid cells
+        invalid_since = {n: -1}
+        for iteration, i, j, origin_line in decided:
+            if origin_line == -1 or origin_line == n or invalid_since.get(origin_line, iteration) < iteration:
+                self.board[i][j] = 0
+                self.origins[i][j] = None
+                if self.use_numpy:
+                    # The lines are views of the board, so the check below can't see that they lost the cell
+                    self.queue_line(i)
+                    self.queue_line(self.height + j)
+                for crossing_line in (i, self.height + j):
+                    invalid_since[crossing_line] = min(invalid_since.get(crossing_line, iteration), iteration)
+
+        # The lines may have cells that never reached the board (a conflict stopped the previous solve)
+        for i in range(self.height):
+            for j in range(self.width):
+                if self.rows[i].get_cell(j) != self.board[i][j]:
+                    self.queue_line(i)
+                if self.columns[j].get_cell(i) != self.board[i][j]:
+                    self.queue_line(self.height + j)
+        self.update_lines()
+        self.queue_line(n)
+        self.conflict = None
+
+    #### SEARCH ####
+    def get_state(self):
+        """ Copy of the board that can be restored with set_state """
+        if self.use_numpy:
+            return self.board.copy()
+        return [row[:] for row in self.board]
+
+    def set_state(self, board):
+        """ Restore a board returned by get_state (the lines are updated and the queue is emptied) """
+        if self.use_numpy:
+            self.board[...] = board
+        else:
+            self.board = [row[:] for row in board]
+        self.update_lines()
+        self.queue.clear()
+        self.queued.clear()
+        self.priority_queue.clear()
+        self.conflict = None
+
+    def set_board_cell(self, i, j, value):
+        """ Set a cell of the board and its lines, and queue the lines to be solved again """
+        # The lines solved from now on see the guess, the ones solved before don't (see self.origins)
+        self.origins[i][j] = (-1, self.line_solves - 1)
+        if self.log is not None:
+            self.log.append(i * self.width + j, value, -1, "guess")
+        self.board[i][j] = value
+        if self.parallel is not None:
+            self.parallel.board[i * self.width + j] = value
+        self.rows[i].set_cell(j, value)
+        self.columns[j].set_cell(i, value)
+        self.queue_line(i)
+        self.queue_line(self.height + j)
+
+    def pick_search_cell(self):
+        """ Get the undecided cell whose row and column have the fewest undecided cells, or None if there are none """
+        row_spaces = [sum(cell == 0 for cell in row) for row in self.board]
+        column_spaces = [sum(self.board[i][j] == 0 for i in range(self.height)) for j in range(self.width)]
+        best_cell = None
+        best_spaces = None
+        for i in range(self.height):
+            if row_spaces[i] == 0:
+                continue
+            for j in range(self.width):
+                if self.board[i][j] == 0 and (best_spaces is None or row_spaces[i] + column_spaces[j] < best_spaces):
+                    best_cell = (i, j)
+                    best_spaces = row_spaces[i] + column_spaces[j]
+        return best_cell
+
+    def lines_match_clues(self):
+        return all([group.length for group in line.get_box_groups()] == line.clues for line in self.lines)
+
+    def search(self, max_solutions=2, max_nodes=None, time_limit=None):
+        """ Solve the game, guessing cells when the line logic gets stuck
+
+        When the board stops changing, an undecided cell is picked (pick_search_cell) and both values are tried,
+        first a box and then a cross. Each guess is propagated with solve and abandoned when it leads to a
+        conflict. The guesses are kept in an explicit stack, so the depth is not limited by the recursion limit.
+
+        Args:
+            max_solutions (int): stop after finding this many solutions (None to find all of them)
+            max_nodes (int): maximum number of guesses (None for no limit)
+            time_limit (float): maximum number of seconds (None for no limit)
+
+        Returns:
+            list: the solutions found. The board is left with the first solution, or with the cells that could be
+            deduced without guessing if there are none. self.search_nodes has the number of guesses and
+            self.search_finished is False if a limit stopped the search before it could tell how many solutions
+            there are
+        """
+        start_time = time.perf_counter()
+        # The time limit also stops the line solving of a guess (see solve)
+        deadline = None if time_limit is None else start_time + time_limit
+        solutions = []
+        self.search_nodes = 0
+        self.search_finished = True
+        if not self.solve(deadline=deadline):
+            return solutions
+        if not self.solve_finished:
+            self.search_finished = False
+            return solutions
+        root_state = self.get_state()
+        stack = [(root_state, None)]
+        while stack:
+            if max_solutions is not None and len(solutions) >= max_solutions:
+                break
+            if ((max_nodes is not None and self.search_nodes >= max_nodes)
+                    or (time_limit is not None and time.perf_counter() - start_time > time_limit)):
+                self.search_finished = False
+                break
+            state, guess = stack.pop()
+            if guess is not None:
+                self.search_nodes += 1
+                self.set_state(state)
+                self.set_board_cell(*guess)
+                if not self.solve(deadline=deadline):
+                    continue
+                if not self.solve_finished:
+                    self.search_finished = False
+                    break
+            cell = self.pick_search_cell()
+            if cell is None:
+                if self.lines_match_clues():
+                    solutions.append([[int(value) for value in row] for row in self.board])
+                continue
+            state = self.get_state()
+            stack.append((state, (*cell, -1)))
+            stack.append((state, (*cell, 1)))
+        self.set_state(solutions[0] if solutions else root_state)
+        # The guesses that led to the board are lost, so none of its cells can be traced back to a line
+        for i in range(self.height):
+            for j in range(self.width):
+                if self.board[i][j] != 0:
+                    self.origins[i][j] = (-1, 0)
+        return solutions
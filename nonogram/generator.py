@@ -0,0 +1,69 @@
+"""
+
+Generation of random nonograms, and of random nonograms with a unique solution.
+
+"""
+import random
+
+from .game import Game
+from .line import Line
+
+
+def generate_random_clues(width, height, p=0.5, rng=random):
+    """ Generate a random nonogram where each cell has a probability p of being filledç
+
+    Not all nonograms generated this way are uniquely solvable, and this program can only solve nonograms with a
+    unique solution
+
+    A seeded random.Random can be passed as rng to always generate the same nonograms
+    """
+
+    board = [[rng.random()<p for j in range(width)] for i in range(height)]
+    row_clues = []
+    for i in range(height):
+        line = Line(width, [])
+        line.cells = board[i]
+        groups = line.get_box_groups()
+        clue = [group.length for group in groups]
+        row_clues.append(clue)
+
+    column_clues = []
+    for j in range(width):
+        line = Line(height, [])
+        column = [board[i][j] for i in range(height)]
+        line.cells = column
+        groups = line.get_box_groups()
+        clue = [group.length for group in groups]
+        column_clues.append(clue)
+
+    return row_clues, column_clues, board
+
+
+def count_solutions(row_clues, column_clues, limit=2, max_nodes=None, time_limit=None):
+    """ Count the solutions of a nonogram, stopping as soon as limit solutions are found
+
+    With the default limit the result is 0 (no solution), 1 (unique solution) or 2 (two or more solutions).
+    Returns None if max_nodes or time_limit (see Game.search) run out before the answer is known
+    """
+    game = Game(row_clues, column_clues)
+    solutions = game.search(max_solutions=limit, max_nodes=max_nodes, time_limit=time_limit)
+    if not game.search_finished:
+        return None
+    return len(solutions)
+
+
+def generate_unique_clues(width, height, p=0.5, rng=random, max_tries=1000, max_nodes=1000):
+    """ Generate random nonograms (see generate_random_clues) until one of them has a unique solution
+
+    Puzzles whose uniqueness can't be decided in max_nodes guesses are skipped. The generated board is always a
+    solution of its clues, so a puzzle without solutions means the clues are wrong and raises RuntimeError instead
+    of being skipped
+    """
+    for _ in range(max_tries):
+        row_clues, column_clues, board = generate_random_clues(width, height, p, rng=rng)
+        count = count_solutions(row_clues, column_clues, max_nodes=max_nodes)
+        if count == 0:
+            raise RuntimeError("The clues generated for a {}x{} board don't fit the board".format(width, height))
+        if count == 1:
+            return row_clues, column_clues, board
+    raise ValueError("No nonogram with a unique solution was found in {} tries".format(max_tries))
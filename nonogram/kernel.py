@@ -0,0 +1,140 @@
+"""
+
+Batched line solver: solves many lines of the same length at once with NumPy array operations.
+
+It computes the same cells as LineMask.solve (the overlap engine), but every step works on all the lines and all
+the positions together, so the Python loops only go over the clues. The lines are given as an (n, length) array of
+cells and an (n, max clues) array of clues padded with zeros (see pack_clues). Positions are stored as int16 to
+keep the arrays small, so the lines can't be longer than 32767 cells.
+
+Any lines of the same length can be solved together, from one game or from many. The arrays only pay off with
+enough lines: on a 25x25 board the sweep of Line.solve is faster, from 50x50 on the kernel is.
+
+NumPy is required, this module is only imported by the games that use it (see Game(schedule="batch")).
+
+"""
+import numpy
+
+
+def pack_clues(clues_list):
+    """ Pack a list of clues into an array padded with zeros and the number of clues of every line
+
+    Example:
+        [[3, 1], [2], []] gives [[3, 1], [2, 0], [0, 0]] and [2, 1, 0]
+    """
+    max_clues = max((len(clues) for clues in clues_list), default=0)
+    clues = numpy.zeros((len(clues_list), max_clues), dtype=numpy.int16)
+    for n, line_clues in enumerate(clues_list):
+        clues[n, :len(line_clues)] = line_clues
+    counts = numpy.array([len(line_clues) for line_clues in clues_list], dtype=numpy.intp)
+    return clues, counts
+
+
+def reverse_clues(clues, counts):
+    """ Reverse the clues of every line (the padding stays at the end) """
+    index = counts[:, None] - 1 - numpy.arange(clues.shape[1])
+    reversed_clues = numpy.take_along_axis(clues, numpy.maximum(index, 0), axis=1)
+    return numpy.where(index >= 0, reversed_clues, 0)
+
+
+def gather(values, index):
+    """ values[n, index[n, i]] for every line n and every i, faster than numpy.take_along_axis (values must be
+    contiguous)
+    """
+    offsets = numpy.arange(values.shape[0])[:, None] * values.shape[1]
+    return values.ravel()[index + offsets]
+
+
+def get_prefix_fits(boxes, crosses, clues, counts):
+    """ Same as LineMask.get_prefix_fits for every line at once
+
+    The loops only go over the clues. Where LineMask shifts a mask by the length of a clue, which is different for
+    every line here, the kernel looks up a shifted position (gather), and the runs of cells without crosses or boxes
+    are measured once for all the clues.
+
+    Returns:
+        tuple[numpy.ndarray, list[numpy.ndarray]]: fits, a (max clues + 1, n, length + 1) array where fits[j, n, i]
+        is True if the first i cells of the line n can hold exactly its first j clues (for j above the number of
+        clues of a line it's the same as for j = count), and for every clue j, an (n, length) array that is True
+        where the clue can start after the previous clues
+    """
+    n_lines, length = boxes.shape
+    positions = numpy.arange(length + 1, dtype=numpy.int16)
+    # Number of cells without crosses from every cell onwards
+    next_crosses = numpy.minimum.accumulate(numpy.where(crosses, positions[:-1], length)[:, ::-1], axis=1)[:, ::-1]
+    run_lengths = next_crosses - positions[:-1]
+    # last_boxes[n, i]: the last box before the cell i (-1 if there are none)
+    last_boxes = numpy.full((n_lines, length + 1), -1, dtype=numpy.int16)
+    numpy.maximum.accumulate(numpy.where(boxes, positions[:-1], -1), axis=1, out=last_boxes[:, 1:])
+
+    fits = numpy.empty((clues.shape[1] + 1, n_lines, length + 1), dtype=bool)
+    fits[0] = last_boxes < 0
+    all_starts = []
+    for j in range(clues.shape[1]):
+        prev_fits = fits[j]
+        clue = clues[:, j:j+1]
+        active = j < counts[:, None]
+        # A clue can start at s if the previous clues fit before s - 1 and s - 1 isn't a box (or s = 0), and there
+        # are no crosses in the cells s to s + clue - 1
+        starts = numpy.empty((n_lines, length), dtype=bool)
+        starts[:, 0] = prev_fits[:, 0]
+        starts[:, 1:] = prev_fits[:, :-2] & ~boxes[:, :-1]
+        starts &= (run_lengths >= clue) & active
+        all_starts.append(starts)
+        # The last end of the clue up to every position is the last start up to position - clue, plus the clue
+        last_starts = numpy.maximum.accumulate(numpy.where(starts, positions[:-1], -1), axis=1)
+        end_starts = positions - clue
+        last_ends = gather(last_starts, numpy.clip(end_starts, 0, length - 1))
+        last_ends = numpy.where((end_starts >= 0) & (last_ends >= 0), last_ends + clue, -1)
+        # A position is reached if there are no boxes between it and the last end
+        fits[j + 1] = numpy.where(active, last_ends > last_boxes, prev_fits)
+    return fits, all_starts
+
+
+def solve_lines(cells, clues, counts):
+    """ Fill every cell that has the same value in all the valid arrangements of the clues, for every line
+
+    Args:
+        cells (numpy.ndarray): (n, length) array of cells (0: empty, 1: box, -1: cross)
+        clues (numpy.ndarray): (n, max clues) array of clues padded with zeros (see pack_clues)
+        counts (numpy.ndarray): number of clues of every line
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]: the solved cells, and a boolean array that is False for the lines where
+        the clues don't fit (their cells are returned as they were)
+    """
+    n_lines, length = cells.shape
+    lines = numpy.arange(n_lines)[:, None]
+    boxes = cells == 1
+    crosses = cells == -1
+    prefix_fits, all_starts = get_prefix_fits(boxes, crosses, clues, counts)
+    fit = prefix_fits[-1, :, length]
+    # suffix_fits[j, n, i]: the cells from i onwards can hold the clues from j onwards (same as
+    # LineMask.get_suffix_fits), from the prefix fits of the mirrored lines
+    reversed_fits, _ = get_prefix_fits(numpy.ascontiguousarray(boxes[:, ::-1]),
+                                       numpy.ascontiguousarray(crosses[:, ::-1]), reverse_clues(clues, counts), counts)
+    clue_numbers = numpy.maximum(counts[None, :] - numpy.arange(clues.shape[1] + 1)[:, None], 0)
+    suffix_fits = numpy.ascontiguousarray(reversed_fits[clue_numbers, lines.T, ::-1])
+
+    # A cell can be a cross if some clues fit before it and the rest after it
+    can_cross = (prefix_fits[:, :, :-1] & suffix_fits[:, :, 1:]).any(axis=0) & ~boxes
+
+    # A cell can be a box if a valid placement of a clue covers it
+    positions = numpy.arange(length, dtype=numpy.int16)
+    can_box = numpy.zeros((n_lines, length), dtype=bool)
+    after = numpy.empty((n_lines, length + 1), dtype=bool)
+    for j, starts in enumerate(all_starts):
+        clue = clues[:, j:j+1]
+        # After a placement there is the end of the line, or a cell that isn't a box followed by the rest of the clues
+        next_fits = suffix_fits[j + 1]
+        after[:, length] = next_fits[:, length]
+        after[:, :-1] = ~boxes & next_fits[:, 1:]
+        starts = starts & gather(after, numpy.minimum(positions + clue, length))
+        # Cell i is covered if the last valid start up to i is after i - clue
+        last_starts = numpy.maximum.accumulate(numpy.where(starts, positions, -1), axis=1)
+        can_box |= (last_starts >= 0) & (last_starts > positions - clue)
+
+    solved = cells.copy()
+    solved[can_box & ~can_cross & fit[:, None]] = 1
+    solved[can_cross & ~can_box & fit[:, None]] = -1
+    return solved, fit
@@ -0,0 +1,745 @@
+"""
+
+A line (row or column) of a nonogram and the strategies that solve it.
+
+"""
+import time
+
+from .cache import LineCache
+from .clues import get_clue_table
+from .linemask import LineMask, get_bit_indices
+
+
+class Line:
+    """ Class that represents a line of a nonogram
+
+    Attributes:
+        length (int): the length of the line
+        cells (list[int]): the contents of the line (0: empty, 1: box, -1: cross)
+        clues (list[int]): the groups of boxes in the line
+        engine (str): how the line is solved, one of Line.ENGINES
+            - "overlap": exact solver that finds every cell forced by the clues in a single call (solve_overlap)
+            - "explain": human-style strategies applied until nothing changes (solve_step)
+        start (int): the first cell the strategies work on. While a subline is solved, start, length, clues and
+            table describe the subline instead of the whole line (see solve_subline)
+        cache (LineCache): solved lines shared by all the lines and sublines (None to disable it)
+        stats (StrategyStats): where the strategies of the line are profiled (None to disable it). The sublines
+            aren't profiled on their own, their work counts for the strategy that created them
+        log (DeductionLog): where the cells changed by every strategy are recorded (None to disable it), together
+            with index (the index of the line in its game) and cell_indices (the index of every cell in the board)
+        TO-DO: complete attributes
+
+    Strategies:
+        - Fill the beginning clues
+        - Fill first and last clue if close to the edges
+        - Surround a group with the same length as the longest clue with crosses
+        - If there is only one clue and any box places, fill the rest of the row (that can't be reached) with crosses
+        - If there is a group of the same length as the first/last clue touching an edge, add a cross at the end
+        to add:
+            - Match groups and clues
+            - If there is any group matched to a clue, subdivide the line in the parts to the left and
+                right of that clue (excluding any crosses) and solve those two individually
+
+    The strategies that work from the start edge take reverse=True to work from the end edge instead (see
+    get_edge), so the mirrored strategies read the same cells without reversing them.
+
+    """
+
+    class Group:
+        """ Class to store info about groups of cells
+
+        A group doesn't keep a copy of its cells, only how many of them are boxes and spaces (empty cells), which is
+        enough to answer has_boxes, is_full... without going through the cells again
+        """
+        __slots__ = ("start", "end", "length", "boxes", "spaces")
+
+        def __init__(self, start=None, end=None, length=None, cells=None, boxes=None, spaces=None):
+            if length is None:
+                self.start = start
+                self.end = end
+                self.length = end - start + 1
+            elif start is None:
+                self.start = end - length + 1
+                self.end = end
+                self.length = length
+            elif end is None:
+                self.start = start
+                self.end = length - start - 1
+                self.length = length
+            if cells is not None:
+                boxes = cells.count(1)
+                spaces = cells.count(0)
+            self.boxes = boxes
+            self.spaces = spaces
+
+        def __str__(self):
+            group_string = (
+                "Start: " + str(self.start) + ", "
+                + "End: " + str(self.end) + ", "
+                + "Length: " + str(self.length) + ", "
+                + "Boxes: " + str(self.boxes) + ", "
+                + "Spaces: " + str(self.spaces)
+            )
+            return group_string
+
+        def __eq__(self, other):
+            if self.start != other.start:
+                return False
+            if self.end != other.end:
+                return False
+            return True
+
+        def has_boxes(self):
+            return self.boxes > 0
+
+        def has_crosses(self):
+            return self.boxes + self.spaces < self.length
+
+        def has_spaces(self):
+            return self.spaces > 0
+
+        def is_full(self):
+            return self.boxes == self.length
+
+        def is_empty(self):
+            return self.spaces == self.length
+
+    ENGINES = ("overlap", "explain")
+    # Strategies of the explain engine, in the order solve_step tries them
+    STRATEGIES = (
+        "fill_start_clues",
+        "fill_edge_clues",
+        "add_crosses_at_edge_groups",
+        "surround_single_clue_with_crosses",
+        "connect_boxes_if_one_clue",
+        "surround_max_size_groups_with_crosses",
+        "fill_edge_spaces_with_crosses_if_close_to_clue",
+        "fill_spaces_shorter_than_min_clue",
+        "fit_clues_in_holes",
+        "solve_sublines_if_clear_correspondence",
+        "solve_subline_if_edge_clues_solved",
+        "solve_subline_if_surrounded_by_crosses",
+        "fill_edge_groups_if_clues_dont_fit",
+        "fill_if_solved",
+        "solve_edge_groups_if_only_edge_clues_fit",
+        "solve_subline_if_matched_clue",
+        # "pad_edge_groups_if_only_two_clues_fit",
+    )
+    cache = LineCache()
+    stats = None
+    log = None
+
+    def __init__(self, length: int, clues: list[int], engine: str = "overlap"):
+        if engine not in self.ENGINES:
+            raise ValueError("The engine must be one of {}".format(", ".join(self.ENGINES)))
+        self.length = length
+        self.cells = [0] * length
+        self.clues = clues
+        self.engine = engine
+        self.table = get_clue_table(length, tuple(clues))
+        self.start = 0
+        # (cells, start, length, version, box groups, groups between crosses) of the last two scans, see get_groups
+        self.groups_cache = []
+        # First cell that can't be part of a valid arrangement after the last solve, None if the clues fit
+        self.conflict = None
+        # Number of cell changes so far, every write that changes a cell goes through set_cell, fill_cell or
+        # fill_cells (or solve), so the line has changed if and only if the version has
+        self.version = 0
+        # Indices of the cells decided by the current solve (after a solve, by the last one), in the order they were
+        # decided, fill_cell and fill_cells add them
+        self.changed = []
+        # time.perf_counter() value after which the explain engine stops (None for no limit), and False if the last
+        # solve stopped there before the cells stopped changing (see solve)
+        self.deadline = None
+        self.solve_finished = True
+
+    #### CELL MANAGEMENT METHODS ####
+    def write_cells(self, cells):
+        self.cells = cells
+
+    def get_cell(self, i):
+        return self.cells[i]
+
+    def set_cell(self, i, value):
+        if self.cells[i] != value:
+            self.cells[i] = value
+            self.version += 1
+
+    def fill_cell(self, i, value):
+        """ Decide the cell i if it is empty, the strategies never overwrite a decided cell (if they would, the clues
+        don't fit, which the exact check of solve finds)
+
+        Raises IndexError if the cell is outside of the line (or of the subline being solved), like a list would
+        """
+        if not self.start <= i < self.start + self.length:
+            raise IndexError("The cell {} is outside of the line".format(i))
+        if self.cells[i] == 0:
+            self.cells[i] = value
+            self.version += 1
+            self.changed.append(i)
+
+    def fill_cells(self, start, end, value):
+        """ Decide the empty cells from start to end - 1 (see fill_cell), the cells outside of the line are skipped """
+        cells = self.cells
+        changed = self.changed
+        count = len(changed)
+        for i in range(max(start, self.start), min(end, self.start + self.length)):
+            if cells[i] == 0:
+                cells[i] = value
+                changed.append(i)
+        self.version += len(changed) - count
+
+    #### EDGES ####
+    def get_edge(self, reverse=False):
+        """ Index of the first cell of the line and the step to the next cell, read from the end edge if reverse
+
+        Example:
+            A line of length 10: get_edge() -> (0, 1), get_edge(reverse=True) -> (9, -1)
+        """
+        if reverse:
+            return self.start + self.length - 1, -1
+        return self.start, 1
+
+    def get_edge_span(self, group, reverse=False):
+        """ Distances of the first and the last cell of a group to the start edge (or to the end edge if reverse) """
+        if reverse:
+            last = self.start + self.length - 1
+            return last - group.end, last - group.start
+        return group.start - self.start, group.end - self.start
+
+    def fill_edge_cell(self, k, value, reverse=False):
+        """ Decide the cell k counted from the start edge (or from the end edge if reverse) if it is empty """
+        first, step = self.get_edge(reverse)
+        if not 0 <= k < self.length:
+            raise IndexError("The cell {} is outside of the line".format(k))
+        self.fill_cell(first + step * k, value)
+
+    def fill_edge_cells(self, start, end, value, reverse=False):
+        """ Decide the empty cells start to end - 1 counted from the start edge (or from the end edge if reverse) """
+        if reverse:
+            start, end = self.length - end, self.length - start
+        self.fill_cells(self.start + max(start, 0), self.start + end, value)
+
+    #### SUBLINES ####
+    def solve_subline(self, start, end, clues):
+        """ Solve the cells start to end - 1 of the line with the given clues, as if they were a line of their own
+
+        The line itself is narrowed to those cells (start, length, clues and table) while the strategies run, so
+        nothing is copied, and it is restored even if a strategy raises. The subline isn't profiled or logged on its
+        own, its work counts for the strategy that solves it. Past the deadline of the line it isn't solved at all
+        (see solve)
+        """
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            self.solve_finished = False
+            return
+        window = (self.start, self.length, self.clues, self.table, self.stats, self.log)
+        self.start = start
+        self.length = max(end - start, 0)
+        self.clues = clues
+        self.table = get_clue_table(self.length, tuple(clues))
+        self.stats = None
+        self.log = None
+        try:
+            self.solve_window()
+        finally:
+            self.start, self.length, self.clues, self.table, self.stats, self.log = window
+
+    #### PICKLING ####
+    def __getstate__(self):
+        """ The clue table and the cached group scans are left out, they are rebuilt from the clues """
+        state = self.__dict__.copy()
+        del state["table"]
+        del state["groups_cache"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.table = get_clue_table(self.length, tuple(self.clues))
+        self.groups_cache = []
+
+    #### OTHER INFO METHODS ####
+    def get_groups(self):
+        """ Get the groups of boxes and the groups between crosses of the line, scanning the cells only once
+
+        The groups are reused until the version of the line changes, so all the strategies of a step share them
+        (the mirrored strategies too, they read the groups from the other end). The last two scans are kept, a
+        subline and the line that solves it take turns. The groups have the indices of the cells in self.cells.
+        Only list cells are cached: the cells of a NumPy board are also written by the crossing lines (see Game)
+        """
+        start = self.start
+        end = start + self.length
+        cacheable = isinstance(self.cells, list)
+        if cacheable:
+            for cells, cached_start, length, version, box_groups, cross_groups in self.groups_cache:
+                if (cells is self.cells and cached_start == start and length == self.length
+                        and version == self.version):
+                    return box_groups, cross_groups
+        cells = self.cells if start == 0 and end == len(self.cells) else self.cells[start:end]
+        if not cacheable:
+            cells = cells.tolist()
+        box_groups = []
+        cross_groups = []
+        box_len = 0
+        gap_len = 0
+        gap_boxes = 0
+        for i, cell in enumerate(cells, start):
+            if cell == 1:
+                box_len += 1
+            elif box_len > 0:
+                box_groups.append(self.Group(end=i-1, length=box_len, boxes=box_len, spaces=0))
+                box_len = 0
+            if cell == -1:
+                if gap_len > 0:
+                    cross_groups.append(self.Group(end=i-1, length=gap_len, boxes=gap_boxes, spaces=gap_len-gap_boxes))
+                    gap_len = 0
+                    gap_boxes = 0
+            else:
+                gap_len += 1
+                gap_boxes += cell == 1
+        if box_len > 0:
+            box_groups.append(self.Group(end=end-1, length=box_len, boxes=box_len, spaces=0))
+        if gap_len > 0:
+            cross_groups.append(self.Group(end=end-1, length=gap_len, boxes=gap_boxes, spaces=gap_len-gap_boxes))
+        if cacheable:
+            scan = (self.cells, start, self.length, self.version, box_groups, cross_groups)
+            self.groups_cache = [scan] + self.groups_cache[:1]
+        return box_groups, cross_groups
+
+    def get_box_groups(self):
+        return self.get_groups()[0]
+
+    def get_table(self):
+        """ The ClueTable of the current clues (rebuilt if the clues were changed in place) """
+        clues = tuple(self.clues)
+        if self.table.clues == clues and self.table.length == self.length:
+            return self.table
+        return get_clue_table(self.length, clues)
+
+    def is_solved(self):
+        if [group.length for group in self.get_box_groups()] == self.clues:
+            self.fill_cells(self.start, self.start + self.length, -1)
+            return True
+        else:
+            return False
+
+    def fill_if_solved(self):
+        if [group.length for group in self.get_box_groups()] == self.clues:
+            self.fill_cells(self.start, self.start + self.length, -1)
+
+    def match_groups_and_clues(self):
+        groups = self.get_box_groups()
+
+    def get_groups_between_crosses(self):
+        return self.get_groups()[1]
+
+    #### EXACT SOLVER ####
+    def get_valid_starts(self):
+        """ Get, for every clue, the positions where it can start in some valid arrangement of the line """
+        placements = LineMask.from_cells(self.cells).get_placements(self.clues)
+        return [[start for start in range(self.length) if starts >> start & 1] for starts in placements]
+
+    def get_extreme_placements(self):
+        """ Get the leftmost and rightmost valid start of every clue given the current cells
+
+        Example:
+            A line of length 10 with the clues [3, 2] and the content (- is a cross)
+            [0 0 0 X 0 0 - 0 0 0]
+            leftmost = [1, 7] and rightmost = [3, 8]
+        """
+        mask = LineMask.from_cells(self.cells)
+        if not mask.get_prefix_fits(self.clues)[-1] >> self.length & 1:
+            raise ValueError("The clues {} don't fit in the line {}".format(self.clues, self.cells))
+        valid_starts = self.get_valid_starts()
+        return [starts[0] for starts in valid_starts], [starts[-1] for starts in valid_starts]
+
+    def solve_overlap(self):
+        """ Fill every cell that has the same value in all the valid arrangements of the clues
+
+        The leftmost and rightmost arrangements are found with a dynamic programming pass from each edge
+        (can the first i cells hold the first j clues?). A cell can be a box if any valid placement of a clue covers
+        it, and it can be a cross if some clues fit before it and the rest after it. Cells that can only be one of
+        the two are filled. The passes work on the whole line at once with the bitmasks of LineMask, so the cost is
+        O(clues) operations on integers of length bits.
+
+        Example:
+            A line of length 10 with the clues [3, 2] and the content (- is a cross)
+            [0 0 0 X 0 0 - 0 0 0]
+            The 3 can start at cells 1 to 3 and the 2 at cells 7 to 8, so the first cell can't have a box and
+            the cell 8 is covered by the 2 in every arrangement:
+            [- 0 0 X 0 0 - 0 X 0]
+
+        If the clues don't fit, the cells are left as they are and self.conflict is set (see LineMask.find_conflict)
+
+        Only the new cells are written, the bits of the solved masks that weren't in the cells, and their indices
+        are added to self.changed
+        """
+        mask = LineMask.from_cells(self.cells)
+        solved = mask.solve(self.clues)
+        if solved is None:
+            self.conflict = mask.find_conflict(self.clues)
+            return
+        count = len(self.changed)
+        for value, new_bits in ((1, solved.boxes & ~mask.boxes), (-1, solved.crosses & ~mask.crosses)):
+            for i in get_bit_indices(new_bits):
+                self.cells[i] = value
+                self.changed.append(i)
+        self.version += len(self.changed) - count
+
+    #### STRATEGIES ####
+    def solve_step(self):
+        """ Try all the strategies once """
+        # is_solved also fills the line with crosses, which has to go through run_strategy to be recorded
+        self.run_strategy("fill_if_solved")
+        if self.is_solved():
+            return
+        for name in self.STRATEGIES:
+            self.run_strategy(name)
+
+    def run_strategy(self, name):
+        """ Run a strategy (a method of the line) recording its calls, time and decided cells in self.stats, and
+        the cells it changed in self.log
+        """
+        if self.stats is None and self.log is None:
+            getattr(self, name)()
+            return
+        count = len(self.changed)
+        start_time = time.perf_counter()
+        getattr(self, name)()
+        elapsed = time.perf_counter() - start_time
+        if self.stats is not None:
+            self.stats.record(name, elapsed, len(self.changed) - count)
+        if self.log is not None:
+            for i in self.changed[count:]:
+                self.log.append(self.cell_indices[i], self.cells[i], self.index, name)
+
+    def solve(self):
+        """ Try to solve the line until there are no changes
+
+        The explain engine checks self.deadline before every step, also in the sublines. If it passes, the solve
+        stops with the cells decided so far (they are all valid), self.solve_finished is False and nothing is
+        cached. The overlap engine solves the line in one go and always finishes
+
+        Returns:
+            bool: True if the clues still fit in the line, False if they don't. Then self.conflict has the first
+            cell that can't be part of a valid arrangement, and the cells may be partially solved (except on a NumPy
+            board, where they are left as they were)
+        """
+        if not isinstance(self.cells, list):
+            # The cells are a view of a NumPy board (see Game): solve a list and write the changed cells back into the
+            # view, so the strategies don't pay for going through the view on every cell
+            view = self.cells
+            cells = self.cells = view.tolist()
+            try:
+                status = self.solve()
+            finally:
+                self.cells = view
+            if status:
+                for i in self.changed:
+                    view[i] = cells[i]
+            else:
+                # The cells of a line whose clues don't fit never reach the board
+                self.changed = []
+            return status
+        self.changed = []
+        self.solve_finished = True
+        return self.solve_window()
+
+    def solve_window(self):
+        """ Solve the cells self.start to self.start + self.length - 1 (the whole line, or the subline being solved)
+        with the engine of the line, reusing the changes cached for the same clues and cells
+
+        Returns:
+            bool: True if the clues fit in the cells, see solve. The indices of the changed cells are added to
+            self.changed
+        """
+        self.conflict = None
+        start = self.start
+        end = start + self.length
+        count = len(self.changed)
+        key = None
+        # With a log the cache is skipped, so that every cell is traced back to the strategy that decided it
+        if self.cache is not None and self.log is None:
+            window = self.cells if start == 0 and end == len(self.cells) else self.cells[start:end]
+            key = (self.engine, tuple(self.clues), tuple(window))
+            changes = self.cache.get(key)
+            if changes is not None:
+                for i, value in changes:
+                    self.cells[start + i] = value
+                    self.changed.append(start + i)
+                self.version += len(changes)
+                return True
+        if self.engine == "overlap":
+            self.run_strategy("solve_overlap")
+        else:
+            deadline = self.deadline
+            try:
+                # The strategies only fill empty cells, so this stops after at most length steps that change cells
+                version = None
+                while version != self.version:
+                    if deadline is not None and time.perf_counter() >= deadline:
+                        self.solve_finished = False
+                        break
+                    version = self.version
+                    self.solve_step()
+            except (IndexError, ValueError):
+                # The strategies assume that the clues fit in the line and can run past its end when they don't
+                pass
+            window = self.cells if start == 0 and end == len(self.cells) else self.cells[start:end]
+            # The strategies don't notice every contradiction, so the result is checked with the exact solver
+            self.conflict = LineMask.from_cells(window).find_conflict(self.clues)
+        if self.conflict is not None:
+            return False
+        # A stopped solve would cache its partial changes as the answer for these cells
+        if key is not None and self.solve_finished:
+            self.cache.put(key, tuple((i - start, self.cells[i]) for i in self.changed[count:]))
+        return True
+
+    def fill_start_clues(self):
+        """ Fill the minimum cells that must have a box from the starting point (empty line)
+
+        1st - The algorithm calculates the "wiggle room" of the row (which is the free spaces if you placed all the
+        clues one after the other)
+        2nd - The clues are places one after the other, but not filling in the first {wiggle_room} cells of each group
+
+        The wiggle room and the first and last start of each clue are looked up in the ClueTable of the line
+
+        Example:
+            A line of length 15 with the clues [4, 3, 4]
+            Clues placed one after the other:
+            [X X X X 0 X X X 0 X X X X 0 0]
+                                       ^ ^  -> wiggle room = 2
+            [0 0 X X 0 0 0 X 0 0 0 X X 0 0]
+             ^ ^       ^ ^     ^ ^          -> first {wiggle_room} cells not filled
+
+        """
+        table = self.get_table()
+        if table.wiggle_room < 0:
+            raise ValueError("The clues {} don't fit in the line {}".format(self.clues, self.cells))
+        for clue, earliest_start, latest_start in zip(self.clues, table.earliest_starts, table.latest_starts):
+            self.fill_cells(self.start + latest_start, self.start + earliest_start + clue, 1)
+
+    def fill_first_clue(self, reverse=False):
+        """ Fills the boxes given by the first clue if there is a box sufficiently close to the starting edge
+
+        Example:
+            There is a line with the following content:
+            [0 0 0 X 0 0 0 0 0 0 0 0 0 0 0]
+            And the first clue (the leftmost) is a 6
+            Then, the first cells up to the 6th and after the first filled cell must be boxes:
+            [0 0 0 X X X 0 0 0 0 0 0 0 0 0]
+
+        """
+        first_clue = self.clues[-1] if reverse else self.clues[0]
+        first, step = self.get_edge(reverse)
+        cells = self.cells
+        for k in range(min(first_clue, self.length)):
+            if cells[first + step * k] == 1:
+                self.fill_edge_cells(k, first_clue, 1, reverse)
+                return
+
+    def fill_last_clue(self):
+        self.fill_first_clue(reverse=True)
+
+    def fill_edge_clues(self):
+        self.fill_first_clue()
+        self.fill_last_clue()
+
+    def add_cross_at_beginning_group(self, reverse=False):
+        """ If there is a group of the same length as the first clue touching the start edge, add a cross at the end"""
+        first_clue = self.clues[-1] if reverse else self.clues[0]
+        first, step = self.get_edge(reverse)
+        cells = self.cells
+        box_at_beginning = cells[first] == 1
+        first_clue_filled = all([cells[first + step * k] == 1 for k in range(min(first_clue, self.length))])
+        if box_at_beginning and first_clue_filled:
+            if first_clue < self.length:
+                self.fill_edge_cell(first_clue, -1, reverse)
+
+    def add_cross_at_end_group(self):
+        self.add_cross_at_beginning_group(reverse=True)
+
+    def add_crosses_at_edge_groups(self):
+        self.add_cross_at_beginning_group()
+        self.add_cross_at_end_group()
+
+    def surround_single_clue_with_crosses(self):
+        """ If the line only has one clue, fill the places that can't have boxes with crosses """
+        if len(self.clues) != 1:
+            return
+        box_groups = self.get_box_groups()
+        if not box_groups:
+            return
+        group_start = box_groups[0].start
+        group_end = box_groups[-1].end
+        padding = self.clues[0] - (group_end - group_start + 1)
+        self.fill_cells(self.start, group_start - padding, -1)
+        self.fill_cells(group_end + padding + 1, self.start + self.length, -1)
+
+    def connect_boxes_if_one_clue(self):
+        """ If the line only has one clue and there are boxes with spaces between them, connect them"""
+        if len(self.clues) != 1:
+            return
+        box_groups = self.get_box_groups()
+        if not box_groups:
+            return
+        self.fill_cells(box_groups[0].start, box_groups[-1].end, 1)
+
+    def surround_max_size_groups_with_crosses(self):
+        """ If there are any groups of the same size as the longest clue, surround them with crosses """
+        groups = self.get_box_groups()
+        max_len_clue = max(self.clues)
+        for group in groups:
+            if group.length == max_len_clue:
+                if group.start - 1 >= self.start:
+                    self.fill_cell(group.start - 1, -1)
+                if group.end + 1 < self.start + self.length:
+                    self.fill_cell(group.end + 1, -1)
+
+    def fill_beginning_spaces_with_crosses_if_close_to_clue(self, reverse=False):
+        box_groups = self.get_box_groups()
+        if not box_groups:
+            return
+        first_clue = self.clues[-1] if reverse else self.clues[0]
+        first_group = box_groups[-1] if reverse else box_groups[0]
+        spaces_at_start = self.get_edge_span(first_group, reverse)[0]
+        if spaces_at_start <= first_clue:
+            spaces_to_fill = spaces_at_start - (first_clue - first_group.length)
+            self.fill_edge_cells(0, spaces_to_fill, -1, reverse)
+            if first_group.length == first_clue and spaces_to_fill + first_group.length < self.length:
+                self.fill_edge_cell(spaces_to_fill + first_group.length, -1, reverse)
+
+    def fill_end_spaces_with_crosses_if_close_to_clue(self):
+        self.fill_beginning_spaces_with_crosses_if_close_to_clue(reverse=True)
+
+    def fill_edge_spaces_with_crosses_if_close_to_clue(self):
+        self.fill_beginning_spaces_with_crosses_if_close_to_clue()
+        self.fill_end_spaces_with_crosses_if_close_to_clue()
+
+    def solve_sublines_if_clear_correspondence(self):
+        groups = self.get_groups_between_crosses()
+        n_groups_with_boxes = sum([group.has_boxes() for group in groups])
+        n_clues = len(self.clues)
+
+        if n_groups_with_boxes == n_clues:
+            clue_ix = 0
+            for group in groups:
+                if group.has_boxes():
+                    if group.length < self.length:
+                        self.solve_subline(group.start, group.end + 1, [self.clues[clue_ix]])
+                    clue_ix += 1
+                else:
+                    self.fill_cells(group.start, group.end + 1, -1)
+
+    def solve_sublines_if_first_clue_solved(self, reverse=False):
+        groups = self.get_groups_between_crosses()
+        if self.is_solved():
+            return
+        if reverse:
+            if groups[-1].is_full():
+                self.solve_subline(self.start, groups[-1].start - 1, self.clues[:-1])
+        elif groups[0].is_full():
+            self.solve_subline(groups[0].end + 2, self.start + self.length, self.clues[1:])
+
+    def solve_subline_if_last_clue_solved(self):
+        self.solve_sublines_if_first_clue_solved(reverse=True)
+
+    def solve_subline_if_edge_clues_solved(self):
+        self.solve_sublines_if_first_clue_solved()
+        self.solve_subline_if_last_clue_solved()
+
+    def solve_subline_if_surrounded_by_crosses(self):
+        groups = self.get_groups_between_crosses()
+        if groups[0].start != self.start or groups[-1].end != self.start + self.length - 1:
+            self.solve_subline(groups[0].start, groups[-1].end + 1, self.clues)
+
+    def fill_spaces_shorter_than_min_clue(self):
+        groups = self.get_groups_between_crosses()
+        min_clue = min(self.clues)
+        for group in groups:
+            if group.length < min_clue:
+                self.fill_cells(group.start, group.end + 1, -1)
+
+    def fit_clues_in_holes(self):
+        # return
+        groups = self.get_groups_between_crosses()
+        if [group.length for group in groups] == self.clues:
+            for group in groups:
+                self.fill_cells(group.start, group.end + 1, 1)
+
+    def fill_first_group_if_clue_dont_fit(self, reverse=False):
+        groups = self.get_groups_between_crosses()
+        first_group = groups[-1] if reverse else groups[0]
+        if first_group.length < (self.clues[-1] if reverse else self.clues[0]):
+            self.fill_cells(first_group.start, first_group.end + 1, -1)
+
+    def fill_last_group_if_clue_dont_fit(self):
+        self.fill_first_group_if_clue_dont_fit(reverse=True)
+
+    def fill_edge_groups_if_clues_dont_fit(self):
+        self.fill_first_group_if_clue_dont_fit()
+        self.fill_last_group_if_clue_dont_fit()
+
+    def solve_first_group_if_only_first_clue_fits(self, reverse=False):
+        groups = self.get_groups_between_crosses()
+        if len(self.clues) < 2:
+            return
+        first_group = groups[-1] if reverse else groups[0]
+        if first_group.has_boxes():
+            # Length of the first two clues (the last two if reverse) with a space between them
+            table = self.get_table()
+            first_two_length = table.suffix_lengths[-3] if reverse else table.prefix_lengths[2]
+            if first_two_length > first_group.length:
+                first_clue = self.clues[-1] if reverse else self.clues[0]
+                self.solve_subline(first_group.start, first_group.end + 1, [first_clue])
+                if reverse and first_group.start - 2 >= self.start:
+                    self.solve_subline(self.start, first_group.start - 1, self.clues[:-1])
+                elif not reverse and first_group.end + 2 < self.start + self.length:
+                    self.solve_subline(first_group.end + 2, self.start + self.length, self.clues[1:])
+
+    def solve_last_group_if_only_first_clue_fits(self):
+        self.solve_first_group_if_only_first_clue_fits(reverse=True)
+
+    def solve_edge_groups_if_only_edge_clues_fit(self):
+        self.solve_first_group_if_only_first_clue_fits()
+        self.solve_last_group_if_only_first_clue_fits()
+
+    def pad_first_group_if_only_two_clues_fit(self, reverse=False):
+        groups = self.get_groups_between_crosses()
+        box_groups = self.get_box_groups()
+        first_group = groups[-1] if reverse else groups[0]
+        if not first_group.has_boxes():
+            return
+        if len(self.clues) < 2:
+            return
+        first_clues = self.clues[-2:][::-1] if reverse else self.clues[:2]
+        first_group_end = self.get_edge_span(first_group, reverse)[1]
+        if first_clues[0] + first_clues[1] + 1 <= first_group_end:
+            print("-"*20)
+            print(self.cells, self.clues)
+            for group in box_groups:
+                if self.get_edge_span(group, reverse)[0] <= first_group_end and group.length == max(first_clues):
+                    if group.start - 1 >= self.start:
+                        self.fill_cell(group.start - 1, -1)
+                    if group.end + 1 < self.start + self.length:
+                        self.fill_cell(group.end + 1, -1)
+            print(self.cells)
+
+    def pad_last_group_if_only_two_clues_fit(self):
+        self.pad_first_group_if_only_two_clues_fit(reverse=True)
+
+    def pad_edge_groups_if_only_two_clues_fit(self):
+        self.pad_first_group_if_only_two_clues_fit()
+        self.pad_last_group_if_only_two_clues_fit()
+
+    def solve_subline_if_matched_clue(self):
+        groups = self.get_groups_between_crosses()
+        matches = {}
+        for group in groups:
+            if group.is_full() and sum([clue == group.length for clue in self.clues]) == 1:
+                clue_ix = self.clues.index(group.length)
+                matches[clue_ix] = group
+        for clue_ix, group in matches.items():
+            if group.start > self.start + 1:
+                self.solve_subline(self.start, group.start - 1, self.clues[:clue_ix])
+            if group.end < self.start + self.length - 2:
+                self.solve_subline(group.end + 2, self.start + self.length, self.clues[clue_ix+1:])
@@ -0,0 +1,231 @@
+"""
+
+Bitmask representation of a line and the exact line solver that works on it.
+
+"""
+
+
+def reverse_bits(mask, length):
+    """ Mirror the first length bits of the mask """
+    return int(format(mask, "0{}b".format(length))[::-1], 2) if length else 0
+
+
+def spread_bits(mask, length):
+    """ Set the length - 1 bits after every set bit of the mask (mask | mask << 1 | ... | mask << length - 1) """
+    spread = mask
+    covered = 1
+    while covered < length:
+        step = min(covered, length - covered)
+        spread |= spread << step
+        covered += step
+    return spread
+
+
+def propagate_bits(seeds, steps):
+    """ Extend every set bit of seeds to the next bits, as long as they are set in steps
+
+    Adding a bit inside a run of ones carries it to the end of the run, so the bits changed by steps + start are
+    the run from the start onwards (plus the bit after the run, which isn't in steps)
+
+    Example:
+        seeds = 0b0000100, steps = 0b0111011 -> 0b0111100
+    """
+    starts = seeds << 1 & steps
+    return seeds | ((steps + starts) ^ steps | starts) & steps
+
+
+def get_bit_indices(mask):
+    """ Indices of the set bits of the mask, from the lowest (the cost is per set bit, not per bit) """
+    indices = []
+    while mask:
+        low_bit = mask & -mask
+        indices.append(low_bit.bit_length() - 1)
+        mask ^= low_bit
+    return indices
+
+
+class LineMask:
+    """ Compact state of a line stored in two integer bitmasks
+
+    Bit i of boxes is set if the cell i has a box, and bit i of crosses if it has a cross. Groups, gaps and the
+    placements of the clues are computed with bit operations on the whole line at once, without building lists of
+    cells.
+
+    Example:
+        The cells [X X 0 - 0 X] (- is a cross) are stored as boxes = 0b100011 and crosses = 0b001000
+    """
+    __slots__ = ("length", "boxes", "crosses")
+
+    def __init__(self, length, boxes=0, crosses=0):
+        self.length = length
+        self.boxes = boxes
+        self.crosses = crosses
+
+    @classmethod
+    def from_cells(cls, cells):
+        boxes = 0
+        crosses = 0
+        for i, cell in enumerate(cells):
+            if cell == 1:
+                boxes |= 1 << i
+            elif cell == -1:
+                crosses |= 1 << i
+        return cls(len(cells), boxes, crosses)
+
+    def to_cells(self):
+        return [1 if self.boxes >> i & 1 else -1 if self.crosses >> i & 1 else 0 for i in range(self.length)]
+
+    def __eq__(self, other):
+        return (self.length, self.boxes, self.crosses) == (other.length, other.boxes, other.crosses)
+
+    def __repr__(self):
+        return "LineMask({}, {:#b}, {:#b})".format(self.length, self.boxes, self.crosses)
+
+    @property
+    def full(self):
+        return (1 << self.length) - 1
+
+    @property
+    def spaces(self):
+        return self.full & ~(self.boxes | self.crosses)
+
+    def reversed(self):
+        """ The mirrored line """
+        return LineMask(self.length, reverse_bits(self.boxes, self.length), reverse_bits(self.crosses, self.length))
+
+    @staticmethod
+    def get_runs(mask):
+        """ Get the (start, length) of every run of set bits in the mask """
+        runs = []
+        while mask:
+            start = (mask & -mask).bit_length() - 1
+            shifted = mask >> start
+            length = (shifted ^ (shifted + 1)).bit_length() - 1
+            runs.append((start, length))
+            mask &= ~(((1 << length) - 1) << start)
+        return runs
+
+    def get_box_groups(self):
+        """ The (start, length) of every group of boxes """
+        return self.get_runs(self.boxes)
+
+    def get_gaps(self):
+        """ The (start, length) of every group of cells between crosses """
+        return self.get_runs(self.full & ~self.crosses)
+
+    def can_place(self, start, length):
+        """ Check if a clue of the given length fits at start, without crosses inside and without boxes touching it """
+        if start < 0 or start + length > self.length:
+            return False
+        block = ((1 << length) - 1) << start
+        neighbours = (block << 1 | block >> 1) & ~block & self.full
+        return not (block & self.crosses) and not (neighbours & self.boxes)
+
+    def get_fitting_starts(self, length):
+        """ Mask with bit s set if a clue of the given length fits at s without crosses (boxes around ignored) """
+        starts = self.full & ~self.crosses
+        covered = 1
+        # starts has bit s set if the cells s to s+covered-1 aren't crosses. covered doubles until it reaches length
+        while covered < length:
+            step = min(covered, length - covered)
+            starts &= starts >> step
+            covered += step
+        return starts & ((1 << max(self.length - length + 1, 0)) - 1)
+
+    def get_prefix_fits(self, clues):
+        """ fits[j] has bit i set if the first i cells can hold exactly the first j clues (bits 0 to length) """
+        not_boxes = self.full & ~self.boxes
+        # A position i can be reached from i-1 if the cell i-1 isn't a box
+        steps = not_boxes << 1
+        first_box = (self.boxes & -self.boxes).bit_length() - 1 if self.boxes else self.length
+        fits = [(1 << (first_box + 1)) - 1]
+        for clue in clues:
+            prev_fits = fits[-1]
+            starts = (prev_fits & not_boxes) << 1 | (prev_fits & 1)
+            ends = (starts & self.get_fitting_starts(clue)) << clue
+            fits.append(propagate_bits(ends, steps))
+        return fits
+
+    def get_suffix_fits(self, clues):
+        """ fits[j] has bit i set if the cells from i onwards can hold exactly the clues from j onwards """
+        reversed_fits = self.reversed().get_prefix_fits(clues[::-1])
+        return [reverse_bits(fits, self.length + 1) for fits in reversed_fits[::-1]]
+
+    def get_placements(self, clues, prefix_fits=None, suffix_fits=None):
+        """ Get, for every clue, a mask with bit s set if the clue can start at s in some valid arrangement """
+        if prefix_fits is None:
+            prefix_fits = self.get_prefix_fits(clues)
+        if suffix_fits is None:
+            suffix_fits = self.get_suffix_fits(clues)
+        not_boxes = self.full & ~self.boxes
+        placements = []
+        for j, clue in enumerate(clues):
+            starts = (prefix_fits[j] & not_boxes) << 1 | (prefix_fits[j] & 1)
+            next_fits = suffix_fits[j+1]
+            ends = (next_fits >> 1 & not_boxes) | (next_fits & 1 << self.length)
+            placements.append(starts & self.get_fitting_starts(clue) & ends >> clue)
+        return placements
+
+    def get_placement_masks(self, clues):
+        """ Enumerate the valid placements of every clue as masks of the cells they cover """
+        placement_masks = []
+        for clue, starts in zip(clues, self.get_placements(clues)):
+            masks = []
+            while starts:
+                low = starts & -starts
+                masks.append(((1 << clue) - 1) * low)
+                starts ^= low
+            placement_masks.append(masks)
+        return placement_masks
+
+    def fits(self, clues):
+        """ Check if the clues have at least one valid arrangement in the line """
+        return bool(self.get_prefix_fits(clues)[-1] >> self.length & 1)
+
+    def find_conflict(self, clues):
+        """ Get the first cell i such that the cells up to i can't start any valid arrangement of the clues, or None
+        if the clues fit in the line
+
+        The cells up to i are followed by enough empty cells to hold all the clues, and they only get more
+        constrained as i grows, so the first failing i is found with a binary search. If every start is valid, the
+        clues run past the end of the line, and the last cell is returned
+
+        Example:
+            The cells [0 X 0 - X X] with the clues [3, 1] give 5: the cells up to 4 still fit (the 1 is the box
+            at 4), but the box at 5 makes a group of 2
+        """
+        if self.fits(clues):
+            return None
+        padding = sum(clues) + len(clues)
+        low = 0
+        high = self.length - 1
+        while low < high:
+            middle = (low + high) // 2
+            prefix = (1 << (middle + 1)) - 1
+            if LineMask(middle + 1 + padding, self.boxes & prefix, self.crosses & prefix).fits(clues):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def solve(self, clues):
+        """ Get the line with every cell that is the same in all the valid arrangements of the clues
+
+        Same as Line.solve_overlap, but every step works on the whole line at once: the positions that can be
+        reached by the first j clues are a mask, and the cells covered by the placements of a clue are the valid
+        starts spread over the length of the clue.
+
+        Returns None if the clues don't fit in the line
+        """
+        prefix_fits = self.get_prefix_fits(clues)
+        if not prefix_fits[-1] >> self.length & 1:
+            return None
+        suffix_fits = self.get_suffix_fits(clues)
+        can_box = 0
+        for clue, starts in zip(clues, self.get_placements(clues, prefix_fits, suffix_fits)):
+            can_box |= spread_bits(starts, clue)
+        can_cross = 0
+        for prefix, suffix in zip(prefix_fits, suffix_fits):
+            can_cross |= prefix & suffix >> 1
+        can_cross &= self.full & ~self.boxes
+        return LineMask(self.length, self.boxes | can_box & ~can_cross, self.crosses | can_cross & ~can_box)
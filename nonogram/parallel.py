@@ -0,0 +1,108 @@
+"""
+
+Multi-core solving of one game (see Game(schedule="parallel")).
+
+The board lives in a shared memory buffer, one signed byte per cell, row by row. Every worker process attaches to it
+and keeps its own Line for every row and column of the game. In the row phase each worker solves a slice of the
+queued rows: it reads their cells from the buffer, solves them and writes the cells it decided back into the buffer.
+The rows don't overlap, so the workers never write the same cell. The workers only send back the cells they
+changed, which the game merges into its own board before the column phase does the same with the columns.
+
+"""
+import os
+import weakref
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from .line import Line
+
+# State of a worker process, set by init_worker
+worker = {}
+
+
+def init_worker(memory_name, width, height, row_clues, column_clues, engine):
+    memory = shared_memory.SharedMemory(name=memory_name)
+    worker["memory"] = memory
+    worker["board"] = memory.buf.cast("b")
+    worker["width"] = width
+    worker["rows"] = [Line(width, clues, engine=engine) for clues in row_clues]
+    worker["columns"] = [Line(height, clues, engine=engine) for clues in column_clues]
+
+
+def solve_shared_lines(is_column, indices):
+    """ Solve the rows (or the columns) with the given indices from the shared board, writing their new cells into it
+
+    Returns:
+        tuple: the indices in the board of the changed cells (array), their values (array), and (index of the line,
+        position in the line) of the first line whose clues don't fit, or None
+    """
+    board = worker["board"]
+    width = worker["width"]
+    lines = worker["columns"] if is_column else worker["rows"]
+    changed_cells = array("i")
+    changed_values = array("b")
+    for index in indices:
+        line = lines[index]
+        cell_indices = range(index, len(board), width) if is_column else range(index * width, (index + 1) * width)
+        line.write_cells(board[cell_indices.start:cell_indices.stop:cell_indices.step].tolist())
+        if not line.solve():
+            return changed_cells, changed_values, (index, line.conflict)
+        for k in line.changed:
+            board[cell_indices[k]] = line.cells[k]
+            changed_cells.append(cell_indices[k])
+            changed_values.append(line.cells[k])
+    return changed_cells, changed_values, None
+
+
+def close_pool(executor, memory, board):
+    executor.shutdown(cancel_futures=True)
+    board.release()
+    memory.close()
+    memory.unlink()
+
+
+class ParallelSolver:
+    """ Pool of worker processes that solve the rows or the columns of a game on a shared board
+
+    The clues are sent to the workers once, when the pool starts, so the pool must be closed (and a new one started)
+    when they change. The pool is also closed when the solver is garbage collected or at exit
+
+    Example:
+        solver = ParallelSolver(2, 2, [[1], [2]], [[2], [1]], workers=2)
+        changed_cells, changed_values, conflict = solver.solve_lines(False, [0, 1])
+        solver.close()
+    """
+    def __init__(self, width, height, row_clues, column_clues, engine="overlap", workers=None):
+        self.width = width
+        self.height = height
+        self.workers = workers or os.cpu_count()
+        self.memory = shared_memory.SharedMemory(create=True, size=max(width * height, 1))
+        self.board = self.memory.buf.cast("b")
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=init_worker,
+            initargs=(self.memory.name, width, height, row_clues, column_clues, engine))
+        self.close = weakref.finalize(self, close_pool, self.executor, self.memory, self.board)
+
+    def write_board(self, board):
+        """ Copy a whole board (list of rows) into the shared buffer """
+        for i, row in enumerate(board):
+            self.board[i * self.width:(i + 1) * self.width] = array("b", row)
+
+    def solve_lines(self, is_column, indices):
+        """ Solve the rows (or the columns) with the given indices, split in one slice per worker
+
+        Returns:
+            tuple: the changed cells and values (see solve_shared_lines) of all the slices, and the first conflict
+        """
+        size = -(-len(indices) // self.workers)
+        slices = [indices[start:start + size] for start in range(0, len(indices), size)]
+        changed_cells = array("i")
+        changed_values = array("b")
+        conflict = None
+        for cells, values, slice_conflict in self.executor.map(solve_shared_lines, [is_column] * len(slices), slices):
+            changed_cells += cells
+            changed_values += values
+            if conflict is None:
+                conflict = slice_conflict
+        return changed_cells, changed_values, conflict
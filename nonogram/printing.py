@@ -0,0 +1,59 @@
+"""
+
+Text printers of boards and games. They are only imported when something is printed.
+
+"""
+
+
+def print_board(board):
+    pieces = {
+        0: "\u25A1",  # empty cell
+        1: "\u25A0",  # box
+        -1: "\u2717"  # cross
+    }
+    for row in board:
+        print(" ".join(pieces[val] for val in row))
+
+
+def print_game(game, show_clues=True):
+    if not show_clues:
+        print_board(game.board)
+        return
+    max_len_row_clue = max([len(" ".join([str(clue) for clue in row_clue])) for row_clue in game.row_clues])
+    max_len_column_clue = max([len(column_clue) for column_clue in game.column_clues])
+    pieces = {
+        0: "\u25A1",  # empty cell
+        1: "\u25A0",  # box
+        -1: "\u2717"  # cross
+    }
+    for i in range(max_len_column_clue):
+        str_line = " " * (max_len_row_clue + 2)
+        for column_clue in game.column_clues:
+            clue_ix = i + len(column_clue) - max_len_column_clue
+            if 0 <= clue_ix < len(column_clue):
+                if len(str(column_clue[clue_ix])) > 1:
+                    str_line = str_line[:-1]
+                str_line += str(column_clue[clue_ix])
+            else:
+                str_line += " "
+            str_line += "  "
+        str_line = str_line[:-1]
+        print(str_line)
+    for i, row in enumerate(game.board):
+        clue_string = " ".join(str(clue) for clue in game.row_clues[i]).rjust(max_len_row_clue)
+        print(clue_string + "  " + "  ".join(pieces[val] for val in row))
+
+
+def print_rows(game):
+    row_board = [row.cells for row in game.rows]
+    print_board(row_board)
+
+
+def print_columns(game):
+    column_board = []
+    for i in range(game.height):
+        row = []
+        for j in range(game.width):
+            row.append(game.columns[j].get_cell(i))
+        column_board.append(row)
+    print_board(column_board)
@@ -0,0 +1,36 @@
+"""
+
+Profiling of the strategies of the lines (see Game(profile=True)).
+
+"""
+
+
+class StrategyStats:
+    """ Profile of the strategies used to solve the lines of a game
+
+    For every strategy it counts the calls, the seconds spent and the cells it decided (cells that were empty
+    before the call and have a box or a cross after it)
+    """
+    def __init__(self):
+        self.strategies = {}
+
+    def record(self, name, elapsed, decided):
+        stats = self.strategies.get(name)
+        if stats is None:
+            stats = self.strategies[name] = {"calls": 0, "time": 0.0, "decided": 0}
+        stats["calls"] += 1
+        stats["time"] += elapsed
+        stats["decided"] += decided
+
+    def to_dict(self):
+        """ The stats of every strategy, from the most to the least expensive """
+        return dict(sorted(self.strategies.items(), key=lambda item: item[1]["time"], reverse=True))
+
+    def to_json(self, **kwargs):
+        import json
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def print_stats(self):
+        print("{:50} {:>8} {:>10} {:>8}".format("Strategy", "Calls", "Time (s)", "Decided"))
+        for name, stats in self.to_dict().items():
+            print("{:50} {:>8} {:>10.4f} {:>8}".format(name, stats["calls"], stats["time"], stats["decided"]))
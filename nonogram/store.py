@@ -0,0 +1,123 @@
+"""
+
+Streaming storage for puzzles and results, one JSON object per line (JSONL).
+
+Puzzles are {"row": [...], "column": [...]} objects. Reading a store never loads the whole file, and adding a
+puzzle appends one line instead of rewriting the file, so the history can grow without limit.
+
+"""
+import json
+import os
+import sys
+
+
+def read_first_char(json_file):
+    """ Read the first character of a file that isn't a space """
+    first_char = json_file.read(1)
+    while first_char.isspace():
+        first_char = json_file.read(1)
+    return first_char
+
+
+def read_json_lines(json_file):
+    """ Yield the objects of a JSONL stream. A JSON list (the old history format) is also accepted """
+    first_char = read_first_char(json_file)
+    if first_char == "[":
+        yield from json.loads(first_char + json_file.read())
+        return
+    first_line = first_char + json_file.readline()
+    if first_line.strip():
+        yield json.loads(first_line)
+    for line in json_file:
+        if line.strip():
+            yield json.loads(line)
+
+
+class PuzzleStore:
+    """ Puzzles stored one per line in a JSONL file, from the oldest to the newest
+
+    Attributes:
+        path (str): the path of the file ("-" reads from stdin)
+    """
+    def __init__(self, path):
+        self.path = path
+
+    def __iter__(self):
+        return self.iter_puzzles()
+
+    def __len__(self):
+        if not os.path.exists(self.path):
+            return 0
+        return sum(1 for _ in self.iter_puzzles())
+
+    def iter_puzzles(self):
+        """ Yield the puzzles one by one """
+        if self.path == "-":
+            yield from read_json_lines(sys.stdin)
+            return
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r') as json_file:
+            yield from read_json_lines(json_file)
+
+    def iter_games(self, **game_kwargs):
+        """ Yield a Game for every puzzle, created only when it is needed """
+        from .game import Game
+        for puzzle in self.iter_puzzles():
+            yield Game(puzzle["row"], puzzle["column"], **game_kwargs)
+
+    def get(self, n):
+        """ Get the puzzle number n (from 0), or the last one if n is -1 """
+        puzzle = None
+        for i, puzzle in enumerate(self.iter_puzzles()):
+            if i == n:
+                return puzzle
+        if n == -1 and puzzle is not None:
+            return puzzle
+        raise IndexError("There is no puzzle number {} in {}".format(n, self.path))
+
+    def append(self, row_clues, column_clues):
+        """ Add a puzzle at the end of the store """
+        self.convert_json_list()
+        with open(self.path, 'a') as json_file:
+            json_file.write(json.dumps({"row": row_clues, "column": column_clues}) + "\n")
+
+    def convert_json_list(self):
+        """ Rewrite a store in the old format (a JSON list with the newest puzzle first) as JSONL """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r') as json_file:
+            first_char = read_first_char(json_file)
+            if first_char != "[":
+                return
+            puzzles = json.loads(first_char + json_file.read())
+        with open(self.path, 'w') as json_file:
+            for puzzle in reversed(puzzles):
+                json_file.write(json.dumps(puzzle) + "\n")
+
+
+class ResultWriter:
+    """ Write result records one per line, as soon as they are ready
+
+    Example:
+        with ResultWriter("results.jsonl") as writer:
+            for record in records:
+                writer.write(record)
+    """
+    def __init__(self, path="-"):
+        self.path = path
+        self.file = None
+
+    def __enter__(self):
+        self.file = sys.stdout if self.path == "-" else open(self.path, 'w')
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.file is not sys.stdout:
+            self.file.close()
+        else:
+            self.file.flush()
+        self.file = None
+
+    def write(self, record):
+        self.file.write(json.dumps(record) + "\n")
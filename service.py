@@ -0,0 +1,169 @@
+"""
+
+Asynchronous solve service: puzzles come in over TCP and are solved in a pool of processes.
+
+Every request is one JSON line with a puzzle in the history format, and an optional id that is sent back with the
+result:
+    {"id": 7, "row": [[1], [3], ...], "column": [[2], [1, 1], ...]}
+Every response is one JSON line with the record of batch.solve_puzzle, and where it came from ("solve", "coalesced"
+if an identical puzzle was already being solved, or "cache"):
+    {"id": 7, "solved": true, "time": 0.004, "iterations": 5, "board": [[1, -1, ...], ...], "source": "solve"}
+
+A connection can send many requests without waiting, the responses are written as soon as they are ready, so they
+may come back in a different order. Identical puzzles that arrive while one of them is being solved wait for that
+solve instead of starting their own, and the finished records are kept in a cache.
+
+Usage:
+    python service.py --port 8765 --workers 8
+    python loadgen.py --port 8765
+
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from batch import solve_puzzle
+
+
+def get_puzzle_key(puzzle):
+    """ Hashable key of the clues of a puzzle, the same for identical puzzles """
+    return tuple(map(tuple, puzzle["row"])), tuple(map(tuple, puzzle["column"]))
+
+
+class SolveService:
+    """ Solve puzzles in a pool of processes, coalescing identical puzzles and caching the records
+
+    Example:
+        async with SolveService(workers=4) as service:
+            record, source = await service.solve({"row": [[1]], "column": [[1]]})
+
+    Attributes:
+        in_flight (dict): future of every puzzle being solved, by puzzle key
+        results (OrderedDict): records of the last cache_size solved puzzles, by puzzle key
+        stats (dict): number of requests, solves, coalesced requests and cache hits
+    """
+    def __init__(self, workers=None, engine="overlap", search=False, cache_size=10000):
+        self.workers = workers or os.cpu_count()
+        self.engine = engine
+        self.search = search
+        self.cache_size = cache_size
+        self.executor = None
+        self.in_flight = {}
+        self.results = OrderedDict()
+        self.stats = {"requests": 0, "solves": 0, "coalesced": 0, "cache_hits": 0}
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def start(self):
+        # Forked workers would inherit the sockets of the open connections, which then never get closed
+        context = multiprocessing.get_context("spawn")
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+    async def solve(self, puzzle):
+        """ Get the record of a puzzle and its source ("solve", "coalesced" or "cache") """
+        self.stats["requests"] += 1
+        key = get_puzzle_key(puzzle)
+        record = self.results.get(key)
+        if record is not None:
+            self.results.move_to_end(key)
+            self.stats["cache_hits"] += 1
+            return record, "cache"
+        future = self.in_flight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+            # shield: a client that goes away doesn't cancel the solve the other clients are waiting for
+            return await asyncio.shield(future), "coalesced"
+
+        self.stats["solves"] += 1
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, solve_puzzle, puzzle, self.engine, self.search)
+        self.in_flight[key] = future
+        try:
+            record = await asyncio.shield(future)
+        finally:
+            del self.in_flight[key]
+        self.results[key] = record
+        if len(self.results) > self.cache_size:
+            self.results.popitem(last=False)
+        return record, "solve"
+
+    async def handle_request(self, line, writer):
+        """ Solve the puzzle of a request line and write the response """
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("a request must be a JSON object")
+            request_id = request.get("id")
+            record, source = await self.solve(request)
+            response = {"id": request_id, **record, "source": source}
+        except (ValueError, KeyError, TypeError) as error:
+            response = {"id": request_id, "error": "Invalid request: {}".format(error)}
+        except Exception as error:
+            # Any other failure of the solve (a worker that crashed...) still gets a response
+            response = {"id": request_id, "error": "Solve failed: {!r}".format(error)}
+        writer.write((json.dumps(response) + "\n").encode())
+        await writer.drain()
+
+    async def handle_connection(self, reader, writer):
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self.handle_request(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.wait(tasks)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        """ Accept connections until the task is cancelled """
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=2 ** 24)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve nonogram solves over TCP, one JSON puzzle per line")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("-w", "--workers", type=int, default=None, help="number of processes (one per core)")
+    parser.add_argument("-e", "--engine", default="overlap", help="line engine (overlap or explain)")
+    parser.add_argument("-s", "--search", action="store_true", help="guess cells when the line logic gets stuck")
+    parser.add_argument("--cache-size", type=int, default=10000, help="number of solved puzzles kept in memory")
+    args = parser.parse_args()
+
+    service = SolveService(args.workers, args.engine, args.search, args.cache_size)
+    service.start()
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+        print(json.dumps(service.stats))
+
+
+if __name__ == "__main__":
+    main()